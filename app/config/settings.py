@@ -43,6 +43,10 @@ class Settings(BaseSettings):
     LEFT_EYE_LANDMARKS: str = "[33, 160, 158, 133, 153, 144]"
     RIGHT_EYE_LANDMARKS: str = "[362, 385, 387, 263, 373, 380]"
     
+    # Stored image artifacts (archival thumbnails, not used for embedding)
+    IMAGE_MAX_SIDE: int = 512
+    JPEG_QUALITY: int = 82
+
     # File paths
     MODELS_PATH: str = "models"
     LOGS_PATH: str = "logs"
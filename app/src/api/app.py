@@ -4,6 +4,7 @@ FastAPI application factory and configuration.
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from config.settings import get_settings
@@ -27,6 +28,7 @@ def create_app() -> FastAPI:
         description="API for FACE",
         version="1.0",
         debug=settings.DEBUG,
+        default_response_class=ORJSONResponse,
         openapi_tags=[
             {
                 "name": "Face",
@@ -64,7 +66,6 @@ def create_app() -> FastAPI:
         try:
             import os
             import cv2
-            from deepface import DeepFace
             import gc
             
             # Create logs directory if not exists
@@ -86,41 +87,30 @@ def create_app() -> FastAPI:
             except Exception as e:
                 logger.error(f"❌ Startup Check: Qdrant ERROR - {e}")
 
-            # Check MinIO
+            # Check MinIO and pre-verify the image buckets so the first
+            # upload skips the head_bucket round-trip
             try:
-                svc.image_processor._get_s3_client().list_buckets()
+                import asyncio
+                await asyncio.to_thread(svc.image_processor.warm_buckets)
                 logger.info("✅ Startup Check: MinIO CONNECTED")
             except Exception as e:
                 logger.error(f"❌ Startup Check: MinIO ERROR - {e}")
 
             test_image_path = './static/images/testface.jpg' 
             
+            from src.utils.legacy import warm_models
+
             if os.path.exists(test_image_path):
                 logger.info(f"Found test image at {test_image_path}. Warming up AI models...")
-                
                 image = cv2.imread(test_image_path)
-                
-                logger.info("Loading Detection Model...")
-                DeepFace.extract_faces(
-                    img_path=image,
-                    detector_backend="yolov8",
-                    align=True,
-                    enforce_detection=False 
-                )
-                
-                logger.info("Loading Recognition Model (VGG-Face)...")
-                DeepFace.represent(
-                    img_path=image,
-                    model_name="VGG-Face",
-                    detector_backend="skip", 
-                    align=True,
-                    normalization="VGGFace2",
-                )
-                
-                logger.info("✅ All AI Models warmed up successfully! Ready to serve requests fast.")
             else:
-                logger.warning(f"⚠️ Test image NOT found at {test_image_path}. Cold start issues will occur!")
+                logger.warning(f"⚠️ Test image NOT found at {test_image_path}. Warming up with a blank frame instead.")
                 logger.warning(f"Current working directory: {os.getcwd()}")
+                image = None
+
+            logger.info("Loading Detection and Recognition Models...")
+            warm_models(image)
+            logger.info("✅ All AI Models warmed up successfully! Ready to serve requests fast.")
                 
         except Exception as e:
             logger.error(f"Error during startup warm-up: {str(e)}")
@@ -130,6 +120,13 @@ def create_app() -> FastAPI:
         """Cleanup resources when the application shuts down."""
         try:
             import gc
+            # Close the pooled database clients
+            from .routers import face as face_router
+            from .routers import database as database_router
+            await face_router.face_service.database_client.aclose()
+            await database_router.face_service.database_client.aclose()
+            # Close the async S3 client if one was opened
+            await face_router.face_service.image_processor.aclose()
             # Force garbage collection
             gc.collect()
             logger.info("Application shutdown successfully, resources cleaned up")
@@ -4,7 +4,9 @@ import logging
 import os
 import tempfile
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from io import BytesIO
 from typing import List
 
@@ -19,6 +21,17 @@ from config.logging import get_minio_logger
 logger = get_minio_logger()
 router = APIRouter(tags=["MinIO"])
 
+# Bounded pool for backup/restore object transfers; boto3 releases the GIL
+# on the socket, so fetching a page of objects concurrently overlaps the
+# per-object round-trips instead of serializing them.
+_TRANSFER_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="minio-transfer")
+
+
+def _fetch_object(s3_client, bucket_name: str, key: str):
+    """Download one object's bytes (runs in _TRANSFER_POOL)."""
+    response = s3_client.get_object(Bucket=bucket_name, Key=key)
+    return key, response['Body'].read()
+
 # Initialize settings and service
 settings = get_settings()
 face_service = FaceService(settings)
@@ -43,11 +56,20 @@ async def list_minio_buckets():
             bucket_name = bucket['Name']
             creation_date = bucket['CreationDate'].isoformat()
             
-            # Get bucket size and object count
+            # Get bucket size and object count. A single list_objects_v2
+            # call truncates at 1000 keys, so paginate with full pages and
+            # sum KeyCount/Size per page in one generator pass.
             try:
-                objects = s3_client.list_objects_v2(Bucket=bucket_name)
-                object_count = objects.get('KeyCount', 0)
-                total_size = sum(obj.get('Size', 0) for obj in objects.get('Contents', []))
+                paginator = s3_client.get_paginator('list_objects_v2')
+                pages = paginator.paginate(
+                    Bucket=bucket_name,
+                    PaginationConfig={'PageSize': 1000}
+                )
+                object_count = 0
+                total_size = 0
+                for page in pages:
+                    object_count += page.get('KeyCount', 0)
+                    total_size += sum(obj.get('Size', 0) for obj in page.get('Contents', ()))
             except ClientError:
                 object_count = 0
                 total_size = 0
@@ -75,6 +97,52 @@ async def list_minio_buckets():
         })
 
 
+@router.get("/presign_upload")
+async def presign_registration_upload(store_id: str, person_type: str, person_id: str, name: str = ""):
+    """
+    Issue a presigned PUT URL for a registration image.
+
+    Large registration photos can be PUT directly to MinIO by the client,
+    so the JPEG bytes never pass through this process. Checkin thumbnails
+    keep the in-process upload path.
+    """
+    if person_type not in ("employee", "customer"):
+        return JSONResponse(status_code=400, content={
+            "status": 2,
+            "message": "person_type must be 'employee' or 'customer'"
+        })
+
+    try:
+        processor = face_service.image_processor
+        bucket_name = (
+            processor.EMPLOYEE_BUCKET if person_type == "employee" else processor.CUSTOMER_BUCKET
+        )
+        object_name = processor._build_object_key(
+            store_id=store_id,
+            person_type=person_type,
+            person_id=person_id,
+            name=name,
+            is_checkin=False,
+        )
+        presigned_url = processor.presign_put(bucket_name, object_name)
+
+        return JSONResponse(content={
+            "status": 0,
+            "message": "Presigned URL created",
+            "presigned_url": presigned_url,
+            "bucket": bucket_name,
+            "key": object_name,
+            "expires_in_seconds": 300
+        })
+
+    except Exception as e:
+        logger.error(f"Failed to presign upload: {str(e)}")
+        return JSONResponse(status_code=500, content={
+            "status": 2,
+            "message": f"Failed to presign upload: {str(e)}"
+        })
+
+
 @router.get("/backup_bucket/{bucket_name}")
 async def backup_minio_bucket(bucket_name: str, background_tasks: BackgroundTasks):
     """
@@ -303,14 +371,12 @@ async def _create_bucket_backup(s3_client, bucket_name: str, zip_path: str):
         
         object_count = 0
         for page in pages:
-            for obj in page.get('Contents', []):
-                key = obj['Key']
-                
-                # Download object
-                response = s3_client.get_object(Bucket=bucket_name, Key=key)
-                content = response['Body'].read()
-                
-                # Add to ZIP with bucket name as folder
+            keys = [obj['Key'] for obj in page.get('Contents', [])]
+
+            # Download the page's objects concurrently, then add them to
+            # the ZIP in order (ZipFile writes are not thread-safe)
+            fetched = _TRANSFER_POOL.map(partial(_fetch_object, s3_client, bucket_name), keys)
+            for key, content in fetched:
                 zip_path_in_archive = f"{bucket_name}/{key}"
                 zipf.writestr(zip_path_in_archive, content)
                 object_count += 1
@@ -330,14 +396,10 @@ async def _create_all_buckets_backup(s3_client, bucket_names: List[str], zip_pat
             
             bucket_objects = 0
             for page in pages:
-                for obj in page.get('Contents', []):
-                    key = obj['Key']
-                    
-                    # Download object
-                    response = s3_client.get_object(Bucket=bucket_name, Key=key)
-                    content = response['Body'].read()
-                    
-                    # Add to ZIP with bucket name as folder
+                keys = [obj['Key'] for obj in page.get('Contents', [])]
+
+                fetched = _TRANSFER_POOL.map(partial(_fetch_object, s3_client, bucket_name), keys)
+                for key, content in fetched:
                     zip_path_in_archive = f"{bucket_name}/{key}"
                     zipf.writestr(zip_path_in_archive, content)
                     bucket_objects += 1
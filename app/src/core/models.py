@@ -14,13 +14,15 @@ class CreateFace(BaseModel):
     
     Parameters:
     - img_base64: Base64 encoded image containing face
+    - img_bytes: Raw image bytes (set by the multipart upload endpoints)
     - id: ID of customer or employee
-    - name: Name of customer or employee  
+    - name: Name of customer or employee
     - role: 1 for Employee, 0 for Customer
     - store_id: Store identifier
     - is_update: Flag to indicate if the face should be updated if it already exists
     """
     img_base64: str = Query(None, description="Ảnh chứa mặt để đăng ký")
+    img_bytes: Optional[bytes] = None
     id: str = Query(None, description="ID của khách hàng/ nhân viên")
     name: str = Query(None, description="Tên của khách hàng/ nhân viên")
     role: str = Query(None, description="1: Nhân viên, 0: Khách hàng")
@@ -46,10 +48,12 @@ class FaceRecog(BaseModel):
     
     Parameters:
     - img_base64: Base64 encoded image containing face
+    - img_bytes: Raw image bytes (set by the multipart upload endpoints)
     - role: 1 for Employee, 0 for Customer
     - store_id: Store identifier
     """
     img_base64: str = Query(None, description="Ảnh chứa mặt để nhận diện")
+    img_bytes: Optional[bytes] = None
     role: str = Query(None, description="1: Nhân viên, 0: Khách hàng")
     store_id: str = Query(None, description="ID cửa hàng")
 
@@ -5,19 +5,26 @@ recognition, and management operations.
 
 import asyncio
 import base64
+import contextvars
 import datetime
+import functools
 import logging
 import os
+import queue
 import shutil
+import sys
+import threading
 import time
 import zipfile
 from typing import Optional, Tuple, Dict, Any, List
+from collections import OrderedDict, defaultdict
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import cv2
 import numpy as np
 import gc
 import httpx
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from fastapi import HTTPException
 
 from ..utils.image_processor import ImageProcessor
@@ -30,7 +37,8 @@ from ..utils.legacy import (
     is_full_face,
     adjust_gamma,
     get_embedding,
-    detect_face,
+    detect_face_with_spoof,
+    embed_face,
     check_condition
 )
 from ..core.models import CreateFace, FaceRecog, DeleteFace
@@ -38,10 +46,237 @@ from config.logging import get_face_logger
 
 logger = get_face_logger()
 
-# Giới hạn kết nối đồng thời 
-HTTP_SEMAPHORE = asyncio.Semaphore(10)
+# Raise the gen0 threshold so batches of large image buffers don't trigger a
+# full collection on every request; the batch endpoints still run one
+# explicit gc.collect() after the whole batch completes.
+gc.set_threshold(50_000, 10, 10)
+
+# Giới hạn kết nối đồng thời
 PROCESSING_SEMAPHORE = asyncio.Semaphore(10)
 
+# Caps in-flight background image saves so checkin bursts cannot pile up
+# unbounded upload tasks
+_SAVE_IMAGE_SEMAPHORE = asyncio.Semaphore(64)
+
+
+def _log_background_save_failure(task: "asyncio.Task") -> None:
+    """Done-callback for fire-and-forget image saves."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Background image save failed: {task.exception()}")
+
+# Shared worker pool for the CPU-bound checks and embedding. Spinning up a
+# ThreadPoolExecutor per request costs thread creation/teardown on every call.
+_CPU_POOL = ThreadPoolExecutor(max_workers=(os.cpu_count() or 4) * 2, thread_name_prefix="face-cpu")
+
+# Stage timing tracer. When TIMING=1 each request collects its stage durations
+# in a ContextVar and flushes them as a single [TIMING] log line, instead of
+# emitting one logger.info per stage on the hot path.
+TIMING_ENABLED = os.getenv("TIMING", "0") == "1"
+_TIMING_SPANS: contextvars.ContextVar = contextvars.ContextVar("timing_spans", default=None)
+
+
+def _timing_start() -> None:
+    """Begin collecting timing spans for the current request."""
+    if TIMING_ENABLED:
+        _TIMING_SPANS.set([])
+
+
+@contextmanager
+def _timer(stage: str):
+    """Record the wall time of a stage into the current request's spans."""
+    spans = _TIMING_SPANS.get()
+    if spans is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        spans.append((stage, time.perf_counter() - start))
+
+
+def _timing_flush(label: str) -> None:
+    """Emit the collected spans as one [TIMING] log line and reset."""
+    spans = _TIMING_SPANS.get()
+    if not spans:
+        return
+    joined = ", ".join(f"{stage}={duration:.3f}s" for stage, duration in spans)
+    total = sum(duration for _, duration in spans)
+    logger.info("[TIMING] %s - %s, total=%.3fs", label, joined, total)
+    _TIMING_SPANS.set(None)
+
+
+# Maps role -> (index into _coll_names, is_checkin). A single dict probe
+# per item instead of an if/elif chain over unpredictable role values.
+_ROLE_MAP = {'1': (0, True), '0': (1, False)}
+
+
+@functools.lru_cache(maxsize=1024)
+def _coll_names(store_id: str) -> Tuple[str, str]:
+    """(Employees, Customers) collection names for a store.
+
+    Cached and interned so the batch paths stop re-building the same two
+    small strings for every item.
+    """
+    return sys.intern(f"{store_id}_Employees"), sys.intern(f"{store_id}_Customers")
+
+
+# Client-side cache for search_face. Repeat visitors (employees clocking in
+# and out) produce near-identical embeddings within minutes; serving those
+# from memory skips the Qdrant round-trip, the dominant latency of the
+# recognize path. Entries are keyed by a 64-bit SimHash of the embedding and
+# verified by cosine similarity before being served.
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "256"))
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "30"))
+SEARCH_CACHE_MIN_COSINE = 0.92
+
+# Optional SIMD base64 decoder (SSSE3/AVX2); the stdlib decoder is the
+# drop-in fallback when pybase64 is not installed.
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode
+
+# Fixed-seed projection planes so SimHash keys are stable for the process
+# lifetime (4096-d embeddings -> 64-bit keys).
+_SIMHASH_PLANES = np.random.default_rng(0).standard_normal((64, 4096)).astype(np.float32)
+
+
+def _simhash_key(emb: np.ndarray) -> bytes:
+    """Quantize an embedding into a 64-bit SimHash bucket key."""
+    return np.packbits(_SIMHASH_PLANES @ emb > 0).tobytes()
+
+
+def _decode_image(img_base64: str) -> np.ndarray:
+    """Decode a base64 JPEG/PNG into a BGR frame.
+
+    Pure CPU work (base64 + imdecode), so callers run it in _CPU_POOL to
+    keep the event loop free while a batch decodes.
+    """
+    # Hand the decoder ascii bytes (skipping its internal str handling);
+    # np.frombuffer is a zero-copy view over the decoded bytes.
+    if isinstance(img_base64, str):
+        img_base64 = img_base64.encode("ascii")
+    contents = _b64decode(img_base64, validate=False)
+    return cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+
+
+def _decode_image_batch(b64_list: List[str]) -> List[Optional[np.ndarray]]:
+    """Decode a whole batch of base64 images in one worker call.
+
+    One thread hop and one GIL-release round-trip for the batch instead of
+    one per item. Items that fail to decode come back as None so one bad
+    upload doesn't sink the batch.
+    """
+    images = []
+    for img_base64 in b64_list:
+        try:
+            images.append(_decode_image(img_base64))
+        except Exception:
+            images.append(None)
+    return images
+
+
+def _iter_files(root: str):
+    """Yield every file path under root.
+
+    Uses os.scandir directly instead of os.walk: one syscall per directory
+    and no extra stat per entry, which matters on snapshot trees with
+    thousands of segment files. Qdrant work files (.tmp, .lock) are skipped.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif not entry.name.endswith(('.tmp', '.lock')):
+                    yield entry.path
+
+
+def _zip_member_compression(file_path: str) -> Tuple[int, Optional[int]]:
+    """(compress_type, compresslevel) for one archive member.
+
+    Qdrant .snapshot files are already packed, so deflating them burns CPU
+    for nothing; the small metadata files alongside them still compress
+    well at the fastest deflate level.
+    """
+    if file_path.endswith('.snapshot'):
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, 1
+
+
+def _build_zip(folders: List[str], out_path: str) -> None:
+    """Zip snapshot folders into out_path.
+
+    The call blocks and is meant to run in a worker thread.
+    """
+    members = []
+    for folder_name in folders:
+        parent = os.path.join(folder_name, '..')
+        for file_path in _iter_files(folder_name):
+            members.append((file_path, os.path.relpath(file_path, parent)))
+
+    with zipfile.ZipFile(out_path, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+        for file_path, arcname in members:
+            compress_type, compresslevel = _zip_member_compression(file_path)
+            zip_file.write(file_path, arcname, compress_type=compress_type, compresslevel=compresslevel)
+
+
+class _QueueWriter:
+    """Minimal non-seekable file object that pushes written chunks to a queue."""
+
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+        self._pos = 0
+
+    def write(self, data) -> int:
+        if data:
+            self._chunks.put(bytes(data))
+            self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def seekable(self) -> bool:
+        return False
+
+
+def _stream_zip(folders: List[str]):
+    """Yield the bytes of a ZIP_STORED archive of folders as they are built.
+
+    zipfile writes happily to a non-seekable stream (it emits data
+    descriptors), so a worker thread produces the archive into a bounded
+    queue and the generator hands chunks straight to the response — no
+    temp file on disk and time-to-first-byte independent of archive size.
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=32)
+    done = object()
+
+    def produce():
+        try:
+            with zipfile.ZipFile(_QueueWriter(chunks), 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+                for folder_name in folders:
+                    parent = os.path.join(folder_name, '..')
+                    for file_path in _iter_files(folder_name):
+                        compress_type, compresslevel = _zip_member_compression(file_path)
+                        zip_file.write(file_path, os.path.relpath(file_path, parent),
+                                       compress_type=compress_type, compresslevel=compresslevel)
+        except Exception as e:
+            logger.error(f"_stream_zip - Error while streaming archive: {str(e)}")
+        finally:
+            chunks.put(done)
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    while (chunk := chunks.get()) is not done:
+        yield chunk
+    worker.join()
+
 
 class FaceService:
     """Service class for handling face recognition operations."""
@@ -50,262 +285,317 @@ class FaceService:
         self.config = config
         self.image_processor = ImageProcessor(config)
         self.database_client = DatabaseClient(config.QDRANT_DB_HOST, config.QDRANT_DB_PORT)
+        # Concurrency limits for the batch endpoints. One semaphore per
+        # service instance, created once instead of per request.
+        self._recog_sem = asyncio.Semaphore(int(os.getenv("RECOG_CONCURRENCY", "10")))
+        self._create_sem = asyncio.Semaphore(int(os.getenv("CREATE_CONCURRENCY", "8")))
+        # LRU of recent positive search results: key -> (embedding, result, timestamp)
+        self._search_cache: OrderedDict = OrderedDict()
+        self._search_cache_hits = 0
+        self._search_cache_lookups = 0
+        # Short-lived cache of the collections list; it only changes when a
+        # new store is provisioned, so periodic backups need not re-fetch it.
+        self._collections_cache: Optional[Tuple[float, List[str]]] = None
+        self._collections_ttl = float(os.getenv("COLLECTIONS_CACHE_TTL", "30"))
     
+    async def _get_collections_cached(self) -> List[str]:
+        """Collections list, cached for a short TTL."""
+        now = time.monotonic()
+        if self._collections_cache is not None and now - self._collections_cache[0] < self._collections_ttl:
+            return self._collections_cache[1]
+        clts = await self.database_client.get_collections()
+        self._collections_cache = (now, clts)
+        return clts
+
+    async def _ensure_collections_tracked(self, store_id: str) -> bool:
+        """ensure_collections_exist plus collections-cache invalidation.
+
+        When the store wasn't verified yet its collections may have just
+        been created, so the next backup has to re-fetch the list.
+        """
+        if self.database_client.is_store_verified(store_id):
+            return True
+        exists = await self.database_client.ensure_collections_exist(store_id)
+        self._collections_cache = None
+        return exists
+
+    def _save_face_image_background(self, data, img_decode, face_id, name, encode_task=None) -> None:
+        """Schedule a checkin image save without gating the response.
+
+        The stored checkin image is an audit artifact, so the recognition
+        response does not need to wait out the MinIO round-trip.
+        Registration saves stay awaited — there the response confirms
+        storage.
+        """
+        async def _save():
+            async with _SAVE_IMAGE_SEMAPHORE:
+                img_bytes = await encode_task if encode_task is not None else None
+                await self.image_processor.save_face_image(
+                    data, img_decode, face_id, name, img_bytes=img_bytes
+                )
+
+        task = asyncio.create_task(_save())
+        task.add_done_callback(_log_background_save_failure)
+
     async def detect_and_embed_face(self, data, is_detect_face: bool = True, is_checkin: bool = True) -> Tuple[bool, Any]:
         """
         Detect face in image and generate embedding with comprehensive validation.
         Async version with parallel processing for better performance.
         """
-        function_start_time = time.time()
-
         async with PROCESSING_SEMAPHORE:
+            contents = img_decode = face = None
             try:
                 # Decode image
-                decode_start = time.time()
-                contents = base64.b64decode(data.img_base64)
-                img_decode = cv2.imdecode(np.frombuffer(contents, np.uint8), -1)
-                decode_time = time.time() - decode_start
-                logger.info(f"[TIMING] {data.store_id} - Image decode time: {decode_time:.3f}s")
-                
+                with _timer("image_decode"):
+                    # Multipart uploads carry the JPEG directly; base64 is
+                    # only decoded for the JSON endpoints
+                    contents = getattr(data, "img_bytes", None)
+                    if not contents:
+                        img_b64 = data.img_base64
+                        if isinstance(img_b64, str):
+                            img_b64 = img_b64.encode("ascii")
+                        contents = _b64decode(img_b64, validate=False)
+                    img_decode = cv2.imdecode(np.frombuffer(contents, np.uint8), -1)
+
                 logger.info(f"detect_and_embed_face - Image decoded successfully from store {data.store_id}")
 
                 # Perform parallel checks if in checkin mode
                 if is_checkin:
-                    parallel_checks_start = time.time()
                     loop = asyncio.get_running_loop()
-                    with ThreadPoolExecutor() as pool:
-                        # Parallel face direction and eyes check
-                        face_direction_task = loop.run_in_executor(pool, check_face_left_right, img_decode)
-                        eyes_open_task = loop.run_in_executor(pool, check_eyes_open, img_decode)
-                        
-                        # Wait for face direction check
+                    # One BGR->RGB conversion shared by both mediapipe
+                    # checks instead of a full-frame copy in each
+                    img_rgb = cv2.cvtColor(img_decode, cv2.COLOR_BGR2RGB)
+                    # Parallel face direction and eyes check
+                    face_direction_task = loop.run_in_executor(_CPU_POOL, check_face_left_right, img_decode, img_rgb)
+                    eyes_open_task = loop.run_in_executor(_CPU_POOL, check_eyes_open, img_decode, img_rgb)
+
+                    # Wait for face direction check
+                    with _timer("initial_checks"):
                         check_flr, message_flr = await face_direction_task
-                        parallel_checks_time = time.time() - parallel_checks_start
-                        logger.info(f"[TIMING] {data.store_id} - Parallel initial checks time: {parallel_checks_time:.3f}s")
-                        logger.info(f"{data.store_id} - Check face left right: {check_flr}")
+                    logger.info(f"{data.store_id} - Check face left right: {check_flr}")
                         
-                        if not check_flr:
-                            del contents, img_decode
-                            gc.collect()
-                            logger.warning(f"{data.store_id} - Face is not aligned properly: {message_flr}")
-                            return False, JSONResponse(status_code=400, content={
-                                'status': 2,
-                                'message': message_flr
-                            })
+                    if not check_flr:
+                        del contents, img_decode
+                        gc.collect()
+                        logger.warning(f"{data.store_id} - Face is not aligned properly: {message_flr}")
+                        return False, ORJSONResponse(status_code=400, content={
+                            'status': 2,
+                            'message': message_flr
+                        })
                         
-                        # Wait for eyes check
-                        check_eyes = await eyes_open_task
-                        logger.info(f"{data.store_id} - Check eyes open: {check_eyes}")
-                        if not check_eyes:
-                            del contents, img_decode
-                            gc.collect()
-                            logger.warning(f"{data.store_id} - Eyes are closed! Please open your eyes")
-                            return False, JSONResponse(status_code=400, content={
-                                'status': 2,
-                                'message': "Eyes are closed! Please open your eyes"
-                            })
+                    # Wait for eyes check
+                    check_eyes = await eyes_open_task
+                    logger.info(f"{data.store_id} - Check eyes open: {check_eyes}")
+                    if not check_eyes:
+                        del contents, img_decode
+                        gc.collect()
+                        logger.warning(f"{data.store_id} - Eyes are closed! Please open your eyes")
+                        return False, ORJSONResponse(status_code=400, content={
+                            'status': 2,
+                            'message': "Eyes are closed! Please open your eyes"
+                        })
 
                 # Face detection
                 if is_detect_face:
                     try:
-                        face_detection_start = time.time()
-                        boxes, scores, distances = detect_face(img_decode)
-                        face_detection_time = time.time() - face_detection_start
-                        logger.info(f"[TIMING] {data.store_id} - Face detection time: {face_detection_time:.3f}s")
+                        with _timer("face_detection"):
+                            boxes, scores, distances, spoof_flags = detect_face_with_spoof(img_decode)
                         logger.info(f"{data.store_id} - Face detected successfully")
                     except Exception as e:
                         del contents, img_decode
                         gc.collect()
                         logger.warning(f"{data.store_id} - Error when detecting face: {str(e)}")
                         if is_checkin:
-                            return False, JSONResponse(status_code=500, content={
+                            return False, ORJSONResponse(status_code=500, content={
                                 'status': 2,
                                 'message': "Error when detecting face! Please try again"
                             })
                         else:
                             return True, (None, img_decode)
-                else:
-                    scores = [0.9]
-                    img_size = img_decode.shape
-                    boxes = [[0, 0, img_size[1], img_size[0]]]
-                    distances = [50]  # Default distance
-                    
+
             except Exception as e:
-                if 'contents' in locals():
-                    del contents
-                if 'img_decode' in locals():
-                    del img_decode
+                contents = img_decode = None
                 gc.collect()
                 logger.warning(f"{data.store_id} - Error when decoding image: {str(e)}")
-                return False, JSONResponse(status_code=500, content={
+                return False, ORJSONResponse(status_code=500, content={
                     'status': 2,
                     'message': "Error when detecting face! Please try again"
                 })
             
             try:
-                # Process detected face
-                idx_large = np.argmin(distances)
-                box = boxes[idx_large]
-                x, y, w, h = box
-                x1, y1, x2, y2 = int(x), int(y), int(x+w), int(y+h)
+                if not is_detect_face:
+                    # No detection requested: embed the whole frame as-is, no
+                    # synthetic bounding box, no crop and no extra copy.
+                    face = img_decode
+                else:
+                    # Process detected face
+                    idx_large = np.argmin(distances)
+                    box = boxes[idx_large]
+                    x, y, w, h = box
+                    x1, y1, x2, y2 = int(x), int(y), int(x+w), int(y+h)
+
+                    # Distance check for checkin
+                    if is_checkin:
+                        with _timer("distance_check"):
+                            distance = distance_face_to_camera((x1, y1, x2, y2), img_decode.shape[1])
+                        logger.info(f"{data.store_id} - Distance from face to camera: {distance}")
+
+                        if distance < 20:
+                            del contents, img_decode
+                            gc.collect()
+                            logger.warning(f"{data.store_id} - Face is too close! Please move back")
+                            return False, ORJSONResponse(status_code=400, content={
+                                'status': 2,
+                                'message': "Face is too close! Please move back"
+                            })
+                        elif distance > 70:
+                            del contents, img_decode
+                            gc.collect()
+                            logger.warning(f"{data.store_id} - Face is too far! Please move forward")
+                            return False, ORJSONResponse(status_code=400, content={
+                                'status': 2,
+                                'message': "Face is too far! Please move forward"
+                            })
+                        logger.info(f"{data.store_id} - Face is in the correct distance")
+
+                    # Crop face into one private contiguous buffer instead of
+                    # a view followed by an astype copy.
+                    with _timer("face_crop"):
+                        face = np.ascontiguousarray(img_decode[y1:y2, x1:x2], dtype=np.uint8)
 
-                # Distance check for checkin
-                if is_checkin:
-                    distance_check_start = time.time()
-                    distance = distance_face_to_camera((x1, y1, x2, y2), img_decode.shape[1])
-                    distance_check_time = time.time() - distance_check_start
-                    logger.info(f"[TIMING] {data.store_id} - Distance check time: {distance_check_time:.3f}s")
-                    logger.info(f"{data.store_id} - Distance from face to camera: {distance}")
-                    
-                    if distance < 20:
-                        del contents, img_decode
-                        gc.collect()
-                        logger.warning(f"{data.store_id} - Face is too close! Please move back")
-                        return False, JSONResponse(status_code=400, content={
-                            'status': 2,
-                            'message': "Face is too close! Please move back"
-                        })
-                    elif distance > 70:
-                        del contents, img_decode
-                        gc.collect()
-                        logger.warning(f"{data.store_id} - Face is too far! Please move forward")
-                        return False, JSONResponse(status_code=400, content={
-                            'status': 2,
-                            'message': "Face is too far! Please move forward"
-                        })
-                    logger.info(f"{data.store_id} - Face is in the correct distance")
-                
-                # Crop face
-                face_crop_start = time.time()
-                face = img_decode[y1:y2, x1:x2]
-                face = face.astype('uint8')
-                face_crop_time = time.time() - face_crop_start
-                logger.info(f"[TIMING] {data.store_id} - Face cropping time: {face_crop_time:.3f}s")
-                
                 del contents
                 
                 # Parallel face quality checks for checkin
                 if is_checkin:
-                    face_quality_checks_start = time.time()
                     loop = asyncio.get_running_loop()
-                    with ThreadPoolExecutor() as pool:
-                        full_face_task = loop.run_in_executor(pool, is_full_face, face)
-                        blur_face_task = loop.run_in_executor(pool, check_detect_blur, face)
-                        
+                    full_face_task = loop.run_in_executor(_CPU_POOL, is_full_face, face)
+                    blur_face_task = loop.run_in_executor(_CPU_POOL, check_detect_blur, face)
+
+                    with _timer("quality_checks"):
                         check_full_face, mess_full_face = await full_face_task
                         check_face_blur = await blur_face_task
+
+                    logger.info(f"{data.store_id} - Check full face: {check_full_face}")
+                    if not check_full_face:
+                        del img_decode, face
+                        gc.collect()
+                        logger.warning(f"{data.store_id} - Face is not full! Please keep your face in the frame")
+                        return False, ORJSONResponse(status_code=400, content={
+                            'status': 2,
+                            'message': mess_full_face
+                        })
                         
-                        face_quality_checks_time = time.time() - face_quality_checks_start
-                        logger.info(f"[TIMING] {data.store_id} - Face quality checks time: {face_quality_checks_time:.3f}s")
-                        
-                        logger.info(f"{data.store_id} - Check full face: {check_full_face}")
-                        if not check_full_face:
-                            del img_decode, face
-                            gc.collect()
-                            logger.warning(f"{data.store_id} - Face is not full! Please keep your face in the frame")
-                            return False, JSONResponse(status_code=400, content={
-                                'status': 2,
-                                'message': mess_full_face
-                            })
-                        
-                        logger.info(f"{data.store_id} - Check face blur: {check_face_blur}")
-                        if not check_face_blur:
-                            del img_decode, face
-                            gc.collect()
-                            logger.warning(f"{data.store_id} - Face is blur! Please keep your face in focus")
-                            return False, JSONResponse(status_code=400, content={
-                                'status': 2,
-                                'message': "Face is blur! Please keep your face in focus"
-                            })
+                    logger.info(f"{data.store_id} - Check face blur: {check_face_blur}")
+                    if not check_face_blur:
+                        del img_decode, face
+                        gc.collect()
+                        logger.warning(f"{data.store_id} - Face is blur! Please keep your face in focus")
+                        return False, ORJSONResponse(status_code=400, content={
+                            'status': 2,
+                            'message': "Face is blur! Please keep your face in focus"
+                        })
                 
-                # Adjust gamma
-                gamma_adjust_start = time.time()
-                face = adjust_gamma(face, gamma=1.5)
-                gamma_adjust_time = time.time() - gamma_adjust_start
-                logger.info(f"[TIMING] {data.store_id} - Gamma adjustment time: {gamma_adjust_time:.3f}s")
+                # Adjust gamma. The cropped buffer is private, so the LUT can
+                # write back into it; the whole-frame path still needs a copy
+                # because img_decode is reused for the anti-spoofing pass.
+                with _timer("gamma_adjust"):
+                    if is_detect_face:
+                        face = adjust_gamma(face, gamma=1.5, dst=face)
+                    else:
+                        face = adjust_gamma(face, gamma=1.5)
 
                 # Generate embedding
                 try:
-                    embedding_start = time.time()
                     loop = asyncio.get_running_loop()
-                    with ThreadPoolExecutor() as pool:
-                        emb_task = loop.run_in_executor(pool, lambda: get_embedding(face, img_decode))
-                        emb, is_real = await emb_task
-                        
-                        embedding_time = time.time() - embedding_start
-                        logger.info(f"[TIMING] {data.store_id} - Face embedding generation time: {embedding_time:.3f}s")
-                        
-                        if not is_real and is_checkin:
-                            del img_decode, face
-                            gc.collect()
-                            logger.warning(f"{data.store_id} - Face is not real! Please use your real face")
-                            return False, JSONResponse(status_code=400, content={
-                                'status': 2,
-                                'message': "Face is not real! Please use your real face"
-                            })
+                    if is_detect_face:
+                        # Detection already ran YOLO + anti-spoof on this
+                        # frame; embed the crop directly and reuse the
+                        # spoof verdict from that single pass.
+                        emb_task = loop.run_in_executor(_CPU_POOL, embed_face, face)
+                        with _timer("embedding"):
+                            emb = await emb_task
+                        is_real = bool(spoof_flags[idx_large]) if len(spoof_flags) else False
+                    else:
+                        emb_task = loop.run_in_executor(_CPU_POOL, get_embedding, face, img_decode)
+                        with _timer("embedding"):
+                            emb, is_real = await emb_task
+
+                    if not is_real and is_checkin:
+                        del img_decode, face
+                        gc.collect()
+                        logger.warning(f"{data.store_id} - Face is not real! Please use your real face")
+                        return False, ORJSONResponse(status_code=400, content={
+                            'status': 2,
+                            'message': "Face is not real! Please use your real face"
+                        })
                 except Exception as e:
                     del face, img_decode
                     gc.collect()
                     logger.warning(f"{data.store_id} - Error when encoding face: {str(e)}")
-                    return False, JSONResponse(status_code=500, content={
+                    return False, ORJSONResponse(status_code=500, content={
                         'status': 2,
                         'message': "Error! Please try again"
                     })
                 
-                total_function_time = time.time() - function_start_time
-                logger.info(f"[TIMING] {data.store_id} - Total face detection and embedding time: {total_function_time:.3f}s")
                 logger.info(f"{data.store_id} - Face is real")
                 
                 return True, (emb, img_decode)
                 
             except Exception as e:
-                if 'img_decode' in locals():
-                    del img_decode
-                if 'face' in locals():
-                    del face
-                if 'contents' in locals():
-                    del contents
+                contents = img_decode = face = None
                 gc.collect()
                 logger.warning(f"{data.store_id} - Error in face processing: {str(e)}")
-                return False, JSONResponse(status_code=500, content={
+                return False, ORJSONResponse(status_code=500, content={
                     'status': 2,
                     'message': "Error when processing face! Please try again"
                 })
     
     async def search_face(self, collection_name: str, embedding: List[float], store_id: str) -> Dict[str, Any]:
         """Search for a face in the database."""
-        start_time = time.time()
-        async with HTTP_SEMAPHORE:
-            data_search = {
-                "collection_name": collection_name,
-                "vector_embedding": embedding,
-                "store_id": store_id
-            }
-            
-            try:
-                search_start = time.time()
+        try:
+            # Probe the in-process cache first: same bucket, fresh enough
+            # and actually close in cosine terms.
+            emb_arr = np.asarray(embedding, dtype=np.float32)
+            cache_key = (collection_name, _simhash_key(emb_arr))
+            self._search_cache_lookups += 1
+            cached = self._search_cache.get(cache_key)
+            if cached is not None:
+                cached_emb, cached_result, cached_at = cached
+                if time.monotonic() - cached_at <= SEARCH_CACHE_TTL:
+                    denom = float(np.linalg.norm(cached_emb) * np.linalg.norm(emb_arr))
+                    if denom > 0 and float(cached_emb @ emb_arr) / denom >= SEARCH_CACHE_MIN_COSINE:
+                        self._search_cache_hits += 1
+                        self._search_cache.move_to_end(cache_key)
+                        if self._search_cache_lookups % 100 == 0:
+                            logger.info(f"search_face - cache hit rate: {self._search_cache_hits / self._search_cache_lookups:.2f}")
+                        return cached_result
+                else:
+                    self._search_cache.pop(cache_key, None)
+
+            with _timer("search"):
                 search_results = await self.database_client.search_point(
                     collection_name=collection_name,
                     vector_embedding=embedding,
                     store_id=store_id
                 )
-                search_time = time.time() - search_start
-                total_time = time.time() - start_time
-                
-                logger.info(f"[TIMING] {store_id} - Face search request time: {search_time:.3f}s")
-                logger.info(f"[TIMING] {store_id} - Total face search time: {total_time:.3f}s")
-                
-                # Convert to expected format
-                if search_results:
-                    formatted_data = []
-                    for result in search_results:
-                        formatted_data.append([result['score'], result['payload']])
-                    return {"message": "Point found", "data": formatted_data}
-                else:
-                    return {"message": "Point not found", "data": []}
-            except Exception as e:
-                logger.error(f"Error in search_face: {str(e)}")
-                return {"data": []}
+
+            # Convert to expected format. Callers only ever look at the best
+            # match, so skip reformatting the rest of the result list.
+            if search_results:
+                best = max(search_results, key=lambda result: result['score'])
+                result = {"message": "Point found", "data": [[best['score'], best['payload']]]}
+                # Only positive matches are cached: caching misses would
+                # hide freshly registered faces for up to the TTL.
+                self._search_cache[cache_key] = (emb_arr, result, time.monotonic())
+                self._search_cache.move_to_end(cache_key)
+                while len(self._search_cache) > SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+                return result
+            else:
+                return {"message": "Point not found", "data": []}
+        except Exception as e:
+            logger.error(f"Error in search_face: {str(e)}")
+            return {"data": []}
     
     def extract_face_info(self, search_result: Dict[str, Any]) -> Tuple[str, str, str]:
         """Extract face information from search result."""
@@ -329,302 +619,267 @@ class FaceService:
             logger.error(f"Error extracting face info: {str(e)}")
             return "Unknown", "Unknown", "Unknown"
     
-    async def recognize_face(self, data: FaceRecog) -> JSONResponse:
+    async def recognize_face(self, data: FaceRecog) -> ORJSONResponse:
         """Recognize a face from the database."""
-        request_start_time = time.time()
+        _timing_start()
         img_decode = None
-        
+
         try:
-            logger.info(f"[TIMING] {data.store_id} - Starting face recognition request")
-            
             # Check input conditions
-            condition_check_start = time.time()
-            check_condition_face, message_condition_face = check_condition(data, is_checkin=True)
-            condition_check_time = time.time() - condition_check_start
-            logger.info(f"[TIMING] {data.store_id} - Condition check time: {condition_check_time:.3f}s")
-            
+            with _timer("condition_check"):
+                check_condition_face, message_condition_face = check_condition(data, is_checkin=True)
+
             if not check_condition_face:
                 logger.warning(f"recognize_face - {data.store_id} - {message_condition_face}")
                 gc.collect()
-                return JSONResponse(status_code=400, content={
+                return ORJSONResponse(status_code=400, content={
                     'status': 2,
                     'message': message_condition_face
                 })
-            
+        
             # Determine collection name and mode
-            if data.role == '1':
-                collection_name = f'{data.store_id}_Employees'
-                is_checkin = True
-            elif data.role == '0':
-                collection_name = f'{data.store_id}_Customers'
-                is_checkin = False
-            else:
+            role_info = _ROLE_MAP.get(data.role)
+            if role_info is None:
                 gc.collect()
-                return JSONResponse(status_code=400, content={
+                return ORJSONResponse(status_code=400, content={
                     'status': 2,
                     'message': "Invalid role"
                 })
-            
-            # Parallel processing: collection check and face detection
-            parallel_start = time.time()
-            collection_task = self.database_client.ensure_collections_exist(data.store_id)
-            detect_task = self.detect_and_embed_face(data, is_checkin=is_checkin)
-            
-            # Wait for parallel results
-            collection_exists, (check_emb, message) = await asyncio.gather(collection_task, detect_task)
-            parallel_time = time.time() - parallel_start
-            logger.info(f"[TIMING] {data.store_id} - Parallel collection check + face detection time: {parallel_time:.3f}s")
-            
+            coll_idx, is_checkin = role_info
+            collection_name = _coll_names(data.store_id)[coll_idx]
+        
+            # Parallel processing: collection check and face detection.
+            # Once a store is verified the collection check is skipped entirely.
+            if self.database_client.is_store_verified(data.store_id):
+                collection_exists = True
+                check_emb, message = await self.detect_and_embed_face(data, is_checkin=is_checkin)
+            else:
+                collection_task = self._ensure_collections_tracked(data.store_id)
+                detect_task = self.detect_and_embed_face(data, is_checkin=is_checkin)
+                collection_exists, (check_emb, message) = await asyncio.gather(collection_task, detect_task)
+
             if not collection_exists:
                 logger.warning(f"recognize_face - {data.store_id} - Error when create collection")
                 gc.collect()
-                return JSONResponse(status_code=500, content={
+                return ORJSONResponse(status_code=500, content={
                     'status': 2,
                     'message': "Error when create collection"
                 })
-            
+        
             if not check_emb:
                 logger.warning(f"recognize_face - {data.store_id} - {message}")
                 gc.collect()
                 return message
-            
+        
             emb, img_decode = message
-            
+        
             # If no embedding (e.g., no face detected)
             if emb is None:
-                save_start = time.time()
-                await self.image_processor.save_face_image(data, img_decode, "Unknown", "Unknown")
-                save_time = time.time() - save_start
-                logger.info(f"[TIMING] {data.store_id} - Save unknown face time: {save_time:.3f}s")
+                with _timer("save_image"):
+                    self._save_face_image_background(data, img_decode, "Unknown", "Unknown")
                 logger.info(f"recognize_face - {data.store_id} - without embedding")
-                
+
                 del img_decode
                 gc.collect()
-                
-                total_time = time.time() - request_start_time
-                logger.info(f"[TIMING] {data.store_id} - Total request time (no embedding): {total_time:.3f}s")
-                
-                return JSONResponse(status_code=200, content={
+
+                return ORJSONResponse(status_code=200, content={
                     'status': 1,
                     'id': "Unknown",
                     'name': "Unknown"
                 })
-            
+        
+            # Start JPEG encoding now so it overlaps the search; the upload
+            # itself still needs face_id/name for the object key.
+            encode_task = asyncio.create_task(self.image_processor.encode_face_image(img_decode))
+
             # Search for face
             search_result = await self.search_face(collection_name, emb, data.store_id)
-            
+
             # Extract face information
-            extract_start = time.time()
             face_id, name, time_created = self.extract_face_info(search_result)
-            extract_time = time.time() - extract_start
-            logger.info(f"[TIMING] {data.store_id} - Extract face info time: {extract_time:.3f}s")
-            
+
             # If face not found
             if face_id == "Unknown" and name == "Unknown":
+                encode_task.cancel()
                 del img_decode, emb
                 gc.collect()
-                
-                total_time = time.time() - request_start_time
-                logger.info(f"[TIMING] {data.store_id} - Total request time (face not found): {total_time:.3f}s")
+
                 logger.warning(f"recognize_face - {data.store_id} - Face is not existed! Please register your face or checkin again")
-                
-                return JSONResponse(status_code=404, content={
+
+                return ORJSONResponse(status_code=404, content={
                     'status': 0,
                     'message': "Face is not existed! Please register your face or checkin again"
                 })
-            
-            # Save recognized face image
-            save_start = time.time()
-            await self.image_processor.save_face_image(data, img_decode, face_id, name)
-            save_time = time.time() - save_start
-            logger.info(f"[TIMING] {data.store_id} - Save recognized face time: {save_time:.3f}s")
-            
+
+            # Save recognized face image in the background; the client gets
+            # its recognition result without waiting on S3
+            with _timer("save_image"):
+                self._save_face_image_background(data, img_decode, face_id, name, encode_task=encode_task)
+
             # Log and return result
-            total_time = time.time() - request_start_time
-            logger.info(f"[TIMING] {data.store_id} - Total successful request time: {total_time:.3f}s")
             logger.info(f"recognize_face - status: 1, id: {face_id}, name: {name}")
             logger.info(f"recognize_face - {data.store_id} - Face is recognized successfully")
-            
+        
             del img_decode, emb
             gc.collect()
-            
-            return JSONResponse(status_code=200, content={
+        
+            return ORJSONResponse(status_code=200, content={
                 'status': 1,
                 'id': face_id,
                 'name': name
             })
-            
+        
         except Exception as e:
-            total_time = time.time() - request_start_time
-            logger.error(f"[TIMING] {data.store_id} - Total request time (error): {total_time:.3f}s")
             logger.error(f"recognize_face - {data.store_id} - Error: {str(e)}")
-            
+
             # Save image with Unknown info in case of error
             try:
                 if img_decode is not None:
                     await self.image_processor.save_face_image(data, img_decode, "Unknown", "Unknown")
             except Exception as save_error:
                 logger.error(f"Failed to save image: {str(save_error)}")
-                
+
             if img_decode is not None:
                 del img_decode
             gc.collect()
-            
-            return JSONResponse(status_code=500, content={
+
+            return ORJSONResponse(status_code=500, content={
                 'status': 1,
                 'id': "Unknown",
                 'name': "Unknown"
             })
-    
-    async def create_face(self, data: CreateFace, update_face=False) -> JSONResponse:
+        finally:
+            _timing_flush(data.store_id)
+
+    async def create_face(self, data: CreateFace, update_face=False) -> ORJSONResponse:
         """Create a new face entry in the database."""
         if update_face or data.is_update:
             data.is_update = True
             logger_text = "update"
         else:
             logger_text = "create"
-    
-        create_face_start_time = time.time()
-        id_value = data.id
-        name_value = data.name 
-        store_id = data.store_id
-        
-        logger.info(f"[TIMING] {store_id} - Starting {logger_text} face request for {name_value} with id {id_value}")
-        logger.info(f"{logger_text}_face - {logger_text} face {name_value} with id {id_value} from store {store_id}")
-        
-        # Check input conditions
-        condition_check_start = time.time()
-        check_condition_face, message_condition_face = check_condition(data, is_checkin=False)
-        condition_check_time = time.time() - condition_check_start
-        logger.info(f"[TIMING] {store_id} - Condition check time: {condition_check_time:.3f}s")
-        
-        if not check_condition_face:
-            logger.warning(f"{store_id} - {message_condition_face}")
-            gc.collect()
-            return JSONResponse(status_code=400, content={
-                'status': 2,
-                'message': message_condition_face
-            })
-        
-        # Determine collection name
-        if data.role == '1':
-            collection_name = f'{store_id}_Employees'
-        elif data.role == '0':
-            collection_name = f'{store_id}_Customers'
-        else:
-            gc.collect()
-            return JSONResponse(status_code=400, content={
-                'status': 2,
-                'message': "Invalid role"
-            })
-        
-        # Parallel processing: collection check and face detection
-        parallel_processing_start = time.time()
-        collection_task = self.database_client.ensure_collections_exist(store_id)
-        detect_task = self.detect_and_embed_face(data, is_checkin=False)
+
+        _timing_start()
+        try:
+            id_value = data.id
+            name_value = data.name
+            store_id = data.store_id
+
+            logger.info(f"{logger_text}_face - {logger_text} face {name_value} with id {id_value} from store {store_id}")
+
+            # Check input conditions
+            with _timer("condition_check"):
+                check_condition_face, message_condition_face = check_condition(data, is_checkin=False)
+
+            if not check_condition_face:
+                logger.warning(f"{store_id} - {message_condition_face}")
+                gc.collect()
+                return ORJSONResponse(status_code=400, content={
+                    'status': 2,
+                    'message': message_condition_face
+                })
         
-        # Wait for parallel results
-        collection_exists, (check_emb, message) = await asyncio.gather(collection_task, detect_task)
-        parallel_processing_time = time.time() - parallel_processing_start
-        logger.info(f"[TIMING] {store_id} - Parallel collection check + face detection time: {parallel_processing_time:.3f}s")
+            # Determine collection name
+            role_info = _ROLE_MAP.get(data.role)
+            if role_info is None:
+                gc.collect()
+                return ORJSONResponse(status_code=400, content={
+                    'status': 2,
+                    'message': "Invalid role"
+                })
+            collection_name = _coll_names(store_id)[role_info[0]]
         
-        if not collection_exists:
-            logger.warning(f"{logger_text}_face - {store_id} - Error when {logger_text} collection")
-            gc.collect()
-            return JSONResponse(status_code=500, content={
-                'status': 2,
-                'message': "Error! Please try again"
-            })
+            # Parallel processing: collection check and face detection.
+            # Once a store is verified the collection check is skipped entirely.
+            if self.database_client.is_store_verified(store_id):
+                collection_exists = True
+                check_emb, message = await self.detect_and_embed_face(data, is_checkin=False)
+            else:
+                collection_task = self._ensure_collections_tracked(store_id)
+                detect_task = self.detect_and_embed_face(data, is_checkin=False)
+                collection_exists, (check_emb, message) = await asyncio.gather(collection_task, detect_task)
+
+            if not collection_exists:
+                logger.warning(f"{logger_text}_face - {store_id} - Error when {logger_text} collection")
+                gc.collect()
+                return ORJSONResponse(status_code=500, content={
+                    'status': 2,
+                    'message': "Error! Please try again"
+                })
         
-        if not check_emb:
-            logger.warning(f"{logger_text}_face - {store_id} - {message}")
-            gc.collect()
-            return message
+            if not check_emb:
+                logger.warning(f"{logger_text}_face - {store_id} - {message}")
+                gc.collect()
+                return message
         
-        emb, img_decode = message
+            emb, img_decode = message
         
-        # If no embedding
-        if emb is None:
-            save_start = time.time()
-            await self.image_processor.save_face_image(data, img_decode, id_value, name_value, is_checkin=False)
-            save_time = time.time() - save_start
-            logger.info(f"[TIMING] {store_id} - Save face image (no embedding) time: {save_time:.3f}s")
-            
-            total_time = time.time() - create_face_start_time
-            logger.info(f"[TIMING] {store_id} - Total {logger_text} face time (no embedding): {total_time:.3f}s")
-            logger.info(f"{logger_text}_face - {store_id} - {logger_text} face {name_value} with id {id_value} successfully without embedding")
-            
-            del img_decode
-            gc.collect()
+            # If no embedding
+            if emb is None:
+                with _timer("save_image"):
+                    await self.image_processor.save_face_image(data, img_decode, id_value, name_value, is_checkin=False)
+                logger.info(f"{logger_text}_face - {store_id} - {logger_text} face {name_value} with id {id_value} successfully without embedding")
             
-            return JSONResponse(status_code=200, content={
-                'status': 1,
-                'message': f'{logger_text} face {name_value} with id {id_value} successfully'
-            })
-        
-        # Check if face already exists
-        if not data.is_update:
-            search_existing_start = time.time()
-            search_result = await self.search_face(collection_name, emb, store_id)
-            search_existing_time = time.time() - search_existing_start
-            logger.info(f"[TIMING] {store_id} - Search existing face time: {search_existing_time:.3f}s")
+                del img_decode
+                gc.collect()
             
-            if search_result.get('data') and len(search_result['data']) > 0:
-                total_time = time.time() - create_face_start_time
-                logger.info(f"[TIMING] {store_id} - Total {logger_text} face time (face exists): {total_time:.3f}s")
-                logger.warning(f"{logger_text}_face - {store_id} - Face is existed! Please use another face")
-                return JSONResponse(status_code=409, content={
-                    'status': 0,
-                    'message': "Face is existed! Please use another face"
+                return ORJSONResponse(status_code=200, content={
+                    'status': 1,
+                    'message': f'{logger_text} face {name_value} with id {id_value} successfully'
                 })
         
-        # Insert new face
-        insert_face_start = time.time()
+            # Check if face already exists
+            if not data.is_update:
+                search_result = await self.search_face(collection_name, emb, store_id)
+
+                if search_result.get('data') and len(search_result['data']) > 0:
+                    logger.warning(f"{logger_text}_face - {store_id} - Face is existed! Please use another face")
+                    return ORJSONResponse(status_code=409, content={
+                        'status': 0,
+                        'message': "Face is existed! Please use another face"
+                    })
         
-        success = await self.database_client.insert_point(
-            collection_name=collection_name,
-            vector_embedding=emb,
-            id=id_value,
-            name=name_value,
-            store_id=store_id,
-            is_update_id=False
-        )
+            # Insert new face
+            with _timer("insert"):
+                success = await self.database_client.insert_point(
+                    collection_name=collection_name,
+                    vector_embedding=emb,
+                    id=id_value,
+                    name=name_value,
+                    store_id=store_id,
+                    is_update_id=False
+                )
+
+            if not success:
+                logger.warning(f"{logger_text}_face - {store_id} - Error when insert face")
+                return ORJSONResponse(status_code=500, content={
+                    'status': 2,
+                    'message': "Error when insert face"
+                })
+
+            # Save image
+            with _timer("save_image"):
+                await self.image_processor.save_face_image(data, img_decode, id_value, name_value, is_checkin=False)
+
+            logger.info(f"{logger_text}_face - {store_id} - {logger_text} face {name_value} with id {id_value} successfully")
         
-        if not success:
-            logger.warning(f"{logger_text}_face - {store_id} - Error when insert face")
-            return JSONResponse(status_code=500, content={
-                'status': 2,
-                'message': "Error when insert face"
+            return ORJSONResponse(status_code=201, content={
+                'status': 1,
+                'message': f'{logger_text} face {name_value} with id {id_value} successfully'
             })
-        
-        insert_face_time = time.time() - insert_face_start
-        logger.info(f"[TIMING] {store_id} - Insert face to database time: {insert_face_time:.3f}s")
-        
-        # Save image
-        save_image_start = time.time()
-        await self.image_processor.save_face_image(data, img_decode, id_value, name_value, is_checkin=False)
-        save_image_time = time.time() - save_image_start
-        logger.info(f"[TIMING] {store_id} - Save face image time: {save_image_time:.3f}s")
-        
-        total_time = time.time() - create_face_start_time
-        logger.info(f"[TIMING] {store_id} - Total successful {logger_text} face time: {total_time:.3f}s")
-        logger.info(f"{logger_text}_face - {store_id} - {logger_text} face {name_value} with id {id_value} successfully")
-        
-        return JSONResponse(status_code=201, content={
-            'status': 1,
-            'message': f'{logger_text} face {name_value} with id {id_value} successfully'
-        })
+        finally:
+            _timing_flush(store_id)
     
-    async def add_employee_face(self, data: CreateFace, background_tasks) -> JSONResponse:
+    async def add_employee_face(self, data: CreateFace, background_tasks) -> ORJSONResponse:
         background_tasks.add_task(
             self.create_face, data, update_face=True
         )
-        return JSONResponse(status_code=201, content={
+        return ORJSONResponse(status_code=201, content={
             'status': 1,
             'message': "Successfully"
         })
     
-    async def delete_face(self, data: DeleteFace) -> JSONResponse:
+    async def delete_face(self, data: DeleteFace) -> ORJSONResponse:
         """
         Delete a face from the database.
         
@@ -632,51 +887,46 @@ class FaceService:
             data: DeleteFace model containing id and store_id
             
         Returns:
-            JSONResponse with status and message
+            JSON response with status and message
         """
-        delete_start_time = time.time()
+        _timing_start()
         id_em = data.id
         store_id = data.store_id
-        
-        logger.info(f"[TIMING] {store_id} - Starting delete face request for id {id_em}")
-        
-        if id_em is None:
-            total_time = time.time() - delete_start_time
-            logger.info(f"[TIMING] {store_id} - Total delete face time (missing id): {total_time:.3f}s")
-            logger.error(f"delete_employee_face - {store_id} - id is required")
-            return JSONResponse(status_code=400, content={
-                'status': 2,
-                'message': "id is required"
-            })
 
-        # Delete from database
-        database_delete_start = time.time()
-        success = await self.database_client.delete_point(
-            collection_name=f"{store_id}_Employees",
-            id=id_em
-        )
-        
-        database_delete_time = time.time() - database_delete_start
-        logger.info(f"[TIMING] {store_id} - Database delete request time: {database_delete_time:.3f}s")
-        
-        total_time = time.time() - delete_start_time
-        
-        if not success:
-            logger.info(f"[TIMING] {store_id} - Total delete face time (not found): {total_time:.3f}s")
-            logger.error(f"delete_employee_face - {store_id} - Error when delete face")
-            return JSONResponse(status_code=404, content={
-                'status': 0,
-                'message': f"Not found employee with id {id_em}"
+        try:
+            if id_em is None:
+                logger.error(f"delete_employee_face - {store_id} - id is required")
+                return ORJSONResponse(status_code=400, content={
+                    'status': 2,
+                    'message': "id is required"
+                })
+
+            # Delete from database
+            with _timer("database_delete"):
+                success = await self.database_client.delete_point(
+                    collection_name=_coll_names(store_id)[0],
+                    id=id_em
+                )
+
+            if not success:
+                logger.error(f"delete_employee_face - {store_id} - Error when delete face")
+                return ORJSONResponse(status_code=404, content={
+                    'status': 0,
+                    'message': f"Not found employee with id {id_em}"
+                })
+
+            logger.info(f"delete_employee_face - {store_id} - Delete face with id {id_em} successfully")
+            # Drop cached search results so the deleted face can't keep being
+            # recognized from the cache until its TTL runs out.
+            self._search_cache.clear()
+            return ORJSONResponse(status_code=200, content={
+                'status': 1,
+                'message': f'Delete face with id {id_em} successfully'
             })
-        
-        logger.info(f"[TIMING] {store_id} - Total successful delete face time: {total_time:.3f}s")
-        logger.info(f"delete_employee_face - {store_id} - Delete face with id {id_em} successfully")
-        return JSONResponse(status_code=200, content={
-            'status': 1,
-            'message': f'Delete face with id {id_em} successfully'
-        })
+        finally:
+            _timing_flush(store_id)
 
-    async def recognize_face_batch(self, data_list: List[FaceRecog]) -> JSONResponse:
+    async def recognize_face_batch(self, data_list: List[FaceRecog]) -> ORJSONResponse:
         """
         Batch face recognition from base64 images.
         
@@ -684,97 +934,113 @@ class FaceService:
             data_list: List of face recognition requests
             
         Returns:
-            JSONResponse with batch processing results
+            JSON response with batch processing results
         """
-        async def process_single_item(data):
-            """Process a single face recognition request."""
-            img_decode = None
+        async def prepare_single_item(data):
+            """Phase 1: validate, decode and embed one request.
+
+            The Qdrant search is deliberately left out; embeddings are
+            grouped per collection afterwards and searched in one
+            round-trip instead of one HTTP call per item.
+            """
             try:
                 # Check condition
                 success, message = check_condition(data, is_checkin=True)
                 if not success:
                     logger.warning(f"batch - {data.store_id} - {message}")
-                    gc.collect()
-                    return
-                
+                    return None
+
                 # Determine collection name
-                if data.role == '1':
-                    collection_name = f'{data.store_id}_Employees'
-                    is_checkin = True
-                elif data.role == '0':
-                    collection_name = f'{data.store_id}_Customers'
-                    is_checkin = False
-                else:
+                role_info = _ROLE_MAP.get(data.role)
+                if role_info is None:
                     logger.warning(f"batch - {data.store_id} - Invalid role")
-                    gc.collect()
-                    return
-                
-                # Check collection exists and detect face in parallel
-                collection_task = self.database_client.ensure_collections_exist(data.store_id)
-                detect_task = self.detect_and_embed_face(data, is_checkin=is_checkin)
-                
-                # Wait for parallel results
-                collection_exists, (check_emb, message) = await asyncio.gather(collection_task, detect_task)
-                
-                if not collection_exists:
-                    logger.warning(f"batch - {data.store_id} - Error with collection")
-                    gc.collect()
-                    return
-                
+                    return None
+                coll_idx, is_checkin = role_info
+                collection_name = _coll_names(data.store_id)[coll_idx]
+
+                # Collections were verified once per store at batch entry
+                check_emb, message = await self.detect_and_embed_face(data, is_checkin=is_checkin)
+
                 if not check_emb:
                     logger.warning(f"batch - {data.store_id} - {message}")
-                    gc.collect()
-                    return
-                
-                emb, img_decode, timing_info = message
-                
+                    return None
+
+                emb, img_decode = message
+
                 # If no embedding
                 if emb is None:
-                    await self.image_processor.save_face_image(data, img_decode, "Unknown", "Unknown")
-                    del img_decode
-                    gc.collect()
-                    return
-                
-                # Search face
-                search_result = await self.search_face(collection_name, emb, data.store_id)
-                face_id, name, _ = self.extract_face_info(search_result)
-                
-                # Save image
-                await self.image_processor.save_face_image(data, img_decode, face_id, name)
-                
-                # Clean up memory
-                del img_decode, emb
-                gc.collect()
-                
+                    self._save_face_image_background(data, img_decode, "Unknown", "Unknown")
+                    return None
+
+                # Start JPEG encoding immediately so it overlaps the
+                # batched search below.
+                encode_task = asyncio.create_task(self.image_processor.encode_face_image(img_decode))
+
+                return data, collection_name, emb, img_decode, encode_task
+
             except Exception as e:
                 logger.error(f"batch - Error processing item: {str(e)}")
-                if 'img_decode' in locals():
-                    del img_decode
-                if 'emb' in locals():
-                    del emb
-                gc.collect()
-        
-        # Process in parallel with semaphore to limit concurrent processing
-        async with asyncio.Semaphore(10) as sem:
-            async def process_with_sem(data):
-                async with sem:
-                    return await process_single_item(data)
-            
-            # Create task list
-            tasks = [process_with_sem(data) for data in data_list]
-            
-            # Process all tasks concurrently with limit
-            await asyncio.gather(*tasks)
-        
+                return None
+
+        # Verify each store's collections once per batch instead of once
+        # per item; ensure_collections_exist caches verified stores so
+        # subsequent batches skip the round-trip entirely.
+        unique_stores = {data.store_id for data in data_list}
+        await asyncio.gather(*(self._ensure_collections_tracked(store_id) for store_id in unique_stores))
+
+        # Phase 1 in parallel with semaphore to limit concurrent processing
+        async def prepare_with_sem(data):
+            async with self._recog_sem:
+                return await prepare_single_item(data)
+
+        prepared = await asyncio.gather(*(prepare_with_sem(data) for data in data_list))
+        items = [item for item in prepared if item is not None]
+
+        # Phase 2: group embeddings per collection and search each group in
+        # a single batched request.
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for idx, (data, collection_name, emb, img_decode, encode_task) in enumerate(items):
+            groups.setdefault((collection_name, data.store_id), []).append(idx)
+
+        matches = [("Unknown", "Unknown")] * len(items)
+
+        async def search_group(collection_name, store_id, indices):
+            results = await self.database_client.search_point_batch(
+                collection_name=collection_name,
+                vector_embeddings=[items[idx][2] for idx in indices],
+                store_id=store_id
+            )
+            for idx, result in zip(indices, results):
+                if result:
+                    best = max(result, key=lambda r: r['score'])
+                    matches[idx] = (
+                        best['payload'].get('id', "Unknown"),
+                        best['payload'].get('name', "Unknown")
+                    )
+
+        await asyncio.gather(*(
+            search_group(collection_name, store_id, indices)
+            for (collection_name, store_id), indices in groups.items()
+        ))
+
+        # Phase 3: schedule the image saves in the background, reusing the
+        # JPEG bytes encoded during phase 2; the batch response does not
+        # wait on S3
+        for item, match in zip(items, matches):
+            data, _, _, img_decode, encode_task = item
+            face_id, name = match
+            self._save_face_image_background(data, img_decode, face_id, name, encode_task=encode_task)
+
         # Ensure memory cleanup
+        del prepared, items, matches
         gc.collect()
-        
-        return JSONResponse(status_code=200, content={
+
+        return ORJSONResponse(status_code=200, content={
             'status': 1,
             'message': "Successfully processed batch"
         })
 
-    async def create_face_batch_customers(self, data_list: List[CreateFace]) -> JSONResponse:
+    async def create_face_batch_customers(self, data_list: List[CreateFace]) -> ORJSONResponse:
         """
         Batch create customer faces from base64 images.
         
@@ -782,46 +1048,37 @@ class FaceService:
             data_list: List of customer face creation requests
             
         Returns:
-            JSONResponse with batch processing results
+            JSON response with batch processing results
         """
-        async def process_single_customer(data):
+        async def process_single_customer(data, img_decode):
             """Process a single customer face creation request."""
             try:
                 id_value = data.id
                 name = data.name
                 store_id = data.store_id
-                role = data.role
-                
-                # Skip non-customer users
-                if role != '0':
-                    return
-                
+
                 # Check conditions
                 success, message = check_condition(data, is_checkin=False)
                 if not success:
                     logger.warning(f"batch_customers - {store_id} - {message}")
                     return
-                
-                # Decode image and save
-                contents = base64.b64decode(data.img_base64)
-                img_decode = cv2.imdecode(np.frombuffer(contents, np.uint8), -1)
-                
+
+                if img_decode is None:
+                    logger.warning(f"batch_customers - {store_id} - Could not decode image for {id_value}")
+                    return
+
                 # Save image in parallel
                 save_task = self.image_processor.save_face_image(data, img_decode, id_value, name, is_checkin=False)
                 
-                # Check collection and detect face in parallel
-                collection_name = f'{store_id}_Customers'
-                collection_task = self.database_client.ensure_collections_exist(store_id)
+                # Detect face; collections were verified once per store at
+                # batch entry
+                collection_name = _coll_names(store_id)[1]
                 detect_task = self.detect_and_embed_face(data, is_detect_face=True, is_checkin=False)
-                
+
                 # Wait for parallel results
                 await save_task
-                collection_exists, (check_emb, message) = await asyncio.gather(collection_task, detect_task)
-                
-                if not collection_exists:
-                    logger.warning(f"batch_customers - {store_id} - Error with collection")
-                    return
-                
+                check_emb, message = await detect_task
+
                 if not check_emb:
                     logger.warning(f"batch_customers - {store_id} - {message}")
                     return
@@ -834,51 +1091,70 @@ class FaceService:
                     
                 # Check if face already exists
                 search_result = await self.search_face(collection_name, emb, store_id)
-                
+
                 if search_result.get('data') and len(search_result['data']) > 0:
                     logger.warning(f"batch_customers - {store_id} - Face already exists for {id_value}")
                     return
-                
-                # Insert new face into database
-                success = await self.database_client.insert_point(
-                    collection_name=collection_name,
-                    vector_embedding=emb,
-                    id=id_value,
-                    name=name,
-                    store_id=store_id,
-                    is_update_id=False
-                )
-                
-                if not success:
-                    logger.warning(f"batch_customers - {store_id} - Error inserting face for {id_value}")
-                    return
-                
-                logger.info(f"batch_customers - {store_id} - Successfully created face for {id_value}")
-                
+
+                # Queue the insert; the batch is flushed once per collection
+                # below instead of one round-trip per item
+                return {
+                    "collection_name": collection_name,
+                    "vector_embedding": emb,
+                    "id": id_value,
+                    "name": name,
+                    "store_id": store_id
+                }
+
             except Exception as e:
                 logger.error(f"batch_customers - Error processing: {str(e)}")
         
+        # Skip non-customer users up front and decode the remaining images
+        # as one batch in a single worker call
+        customers = [data for data in data_list if data.role == '0']
+        decoded = await asyncio.to_thread(_decode_image_batch, [data.img_base64 for data in customers])
+
+        # Verify each store's collections once per batch instead of once
+        # per item
+        unique_stores = {data.store_id for data in customers}
+        await asyncio.gather(*(self._ensure_collections_tracked(store_id) for store_id in unique_stores))
+
         # Process in parallel with semaphore to limit concurrent processing
-        async with asyncio.Semaphore(8) as sem:
-            async def process_with_sem(data):
-                async with sem:
-                    return await process_single_customer(data)
-            
-            # Create task list
-            tasks = [process_with_sem(data) for data in data_list]
-            
-            # Process all tasks concurrently with limit
-            await asyncio.gather(*tasks)
-        
+        async def process_with_sem(data, img_decode):
+            async with self._create_sem:
+                return await process_single_customer(data, img_decode)
+
+        results = await asyncio.gather(*(
+            process_with_sem(data, img_decode) for data, img_decode in zip(customers, decoded)
+        ))
+
+        # Flush queued inserts with one batched request per collection
+        pending = defaultdict(list)
+        for item in results:
+            if item is not None:
+                pending[item.pop("collection_name")].append(item)
+
+        insert_results = await asyncio.gather(*(
+            self.database_client.insert_points_batch(collection_name, items)
+            for collection_name, items in pending.items()
+        ))
+        for collection_name, item_results in zip(pending, insert_results):
+            failed = len(item_results) - sum(item_results)
+            if failed == 0:
+                logger.info(f"batch_customers - Inserted {len(pending[collection_name])} faces into {collection_name}")
+            else:
+                logger.warning(f"batch_customers - {failed}/{len(item_results)} inserts failed for {collection_name}")
+
         # Ensure memory cleanup
+        del customers, decoded, results, pending
         gc.collect()
-        
-        return JSONResponse(status_code=200, content={
+
+        return ORJSONResponse(status_code=200, content={
             'status': 1,
             'message': "Successfully processed batch customers"
         })
 
-    async def backup_db_one(self, store_id: str, background_tasks) -> JSONResponse:
+    async def backup_db_one(self, store_id: str, background_tasks) -> ORJSONResponse:
         """
         Backup database for a single store.
         
@@ -890,65 +1166,46 @@ class FaceService:
             FileResponse with backup ZIP file
         """
         
-        backup_start_time = time.time()
-        logger.info(f"[TIMING] {store_id} - Starting backup database for store {store_id}")
-        
-        file_path_customer = f'./snapshots/{store_id}_Customers'
-        file_path_employee = f'./snapshots/{store_id}_Employees'
-        
-        # Check snapshot existence
-        # check_start = time.time()
-        # if not os.path.exists(file_path_customer) or not os.path.exists(file_path_employee):
-        #     total_time = time.time() - backup_start_time
-        #     logger.info(f"[TIMING] {store_id} - Total backup time (snapshot not found): {total_time:.3f}s")
-        #     return JSONResponse(status_code=404, content={
-        #         'status': 0,
-        #         'message': "Not found snapshot"
-        #     })
-        # check_time = time.time() - check_start
-        # logger.info(f"[TIMING] {store_id} - Snapshot existence check time: {check_time:.3f}s")
-        
-        # Create snapshots
-        try:
-            snapshot_create_start = time.time()
-            for collection_name in [f'{store_id}_Employees', f'{store_id}_Customers']:
-                await self.database_client.create_snapshot(collection_name)
-            snapshot_create_time = time.time() - snapshot_create_start
-            logger.info(f"[TIMING] {store_id} - Snapshot creation time: {snapshot_create_time:.3f}s")
-        except Exception as e:
-            pass
-        
-        time_save = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
-        zipfile_name = f'snapshots_{store_id}_{time_save}.zip'
-        
+        _timing_start()
+        logger.info(f"backup_db_one - Starting backup database for store {store_id}")
+
+        employees_collection, customers_collection = _coll_names(store_id)
+        file_path_customer = f'./snapshots/{customers_collection}'
+        file_path_employee = f'./snapshots/{employees_collection}'
+
         try:
-            # Create zip file
-            zip_create_start = time.time()
-            with zipfile.ZipFile(f'./{zipfile_name}', 'w') as zip_file:
-                for folder_name in [file_path_customer, file_path_employee]:
-                    for root, dirs, files in os.walk(folder_name):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arcname = os.path.relpath(file_path, os.path.join(folder_name, '..'))
-                            zip_file.write(file_path, arcname)
-            zip_create_time = time.time() - zip_create_start
-            logger.info(f"[TIMING] {store_id} - Zip file creation time: {zip_create_time:.3f}s")
-            
-            background_tasks.add_task(os.remove, f'./{zipfile_name}')
-            
-            total_time = time.time() - backup_start_time
-            logger.info(f"[TIMING] {store_id} - Total successful backup time: {total_time:.3f}s")
-            
-            return FileResponse(f'./{zipfile_name}', media_type='application/zip', filename=zipfile_name)
-        except Exception as e:
-            total_time = time.time() - backup_start_time
-            logger.info(f"[TIMING] {store_id} - Total backup time (error): {total_time:.3f}s")
-            return JSONResponse(status_code=500, content={
-                'status': 2,
-                'message': str(e)
-            })
+            # Create both snapshots concurrently
+            with _timer("snapshot_create"):
+                collections = [employees_collection, customers_collection]
+                results = await asyncio.gather(
+                    *(self.database_client.create_snapshot(collection_name) for collection_name in collections),
+                    return_exceptions=True
+                )
+                for collection_name, result in zip(collections, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"backup_db_one - {store_id} - Snapshot failed for {collection_name}: {result}")
+
+            time_save = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+            zipfile_name = f'snapshots_{store_id}_{time_save}.zip'
+
+            try:
+                # Create zip file off the event loop
+                with _timer("zip_create"):
+                    await asyncio.to_thread(_build_zip, [file_path_customer, file_path_employee], f'./{zipfile_name}')
+
+                background_tasks.add_task(os.remove, f'./{zipfile_name}')
+
+                return FileResponse(f'./{zipfile_name}', media_type='application/zip', filename=zipfile_name)
+            except Exception as e:
+                logger.error(f"backup_db_one - {store_id} - Error: {str(e)}")
+                return ORJSONResponse(status_code=500, content={
+                    'status': 2,
+                    'message': str(e)
+                })
+        finally:
+            _timing_flush(store_id)
 
-    async def backup_all_db(self, background_tasks) -> JSONResponse:
+    async def backup_all_db(self, background_tasks) -> ORJSONResponse:
         """
         Backup all databases
         
@@ -959,92 +1216,58 @@ class FaceService:
             FileResponse with backup ZIP file containing all databases
         """
         
-        backup_all_start_time = time.time()
-        logger.info("[TIMING] backup_all - Starting backup all databases")
-        
-        headers = {
-            'Content-Type': 'application/json',
-        }
-        
-        # Get collections list
-        get_collections_start = time.time()
-        clts = await self.database_client.get_collections()
-        logger.info(f"[TIMING] backup_all - Collections list retrieved: {clts}")
-        get_collections_time = time.time() - get_collections_start
-        logger.info(f"[TIMING] backup_all - Get collections list time: {get_collections_time:.3f}s")
-        
-        files_path_customer = []
-        files_path_employee = []
-        
-        # Organize collections
-        organize_start = time.time()
-        for clt in clts:
-            if (clt.endswith('Customers')):
-                files_path_customer.append(clt)
-            elif (clt.endswith('Employees')):
-                files_path_employee.append(clt)
-        organize_time = time.time() - organize_start
-        logger.info(f"[TIMING] backup_all - Collections organization time: {organize_time:.3f}s")
-        logger.info(f"[TIMING] backup_all - Customer collections: {files_path_customer}")
-        logger.info(f"[TIMING] backup_all - Employee collections: {files_path_employee}")
-        
-        # Check snapshot existence
-        # check_snapshots_start = time.time()
-        
-        # for file_path_customer, file_path_employee in zip(files_path_customer, files_path_employee):
-        #     if not os.path.exists("./snapshots/"+file_path_customer) or not os.path.exists("./snapshots/"+file_path_employee):
-        #         total_time = time.time() - backup_all_start_time
-        #         logger.info(f"[TIMING] backup_all - Total backup time (snapshot not found): {total_time:.3f}s")
-        #         return JSONResponse(status_code=404, content={
-        #             'status': 0,
-        #             'message': "Not found snapshot"
-        #         })
-        # check_snapshots_time = time.time() - check_snapshots_start
-        # logger.info(f"[TIMING] backup_all - Snapshots existence check time: {check_snapshots_time:.3f}s")
-        
-        # Create snapshots
-        try:
-            snapshot_create_start = time.time()
-            for clt_name_cus, clt_name_emp in zip(files_path_customer, files_path_employee):
-                await self.database_client.create_snapshot(clt_name_cus)
-                await self.database_client.create_snapshot(clt_name_emp)
-            snapshot_create_time = time.time() - snapshot_create_start
-            logger.info(f"[TIMING] backup_all - All snapshots creation time: {snapshot_create_time:.3f}s")
-        except Exception as e:
-            pass
-        
-        time_save = datetime.datetime.now().strftime("%Y_%m_%d_")
-        zipfile_name = f'snapshots_{time_save}.zip'
-        
+        _timing_start()
+        logger.info("backup_all - Starting backup all databases")
+
         try:
-            # Create zip file
-            zip_create_start = time.time()
-            with zipfile.ZipFile(f'./{zipfile_name}', 'w') as zip_file:
-                for file_path_customer, file_path_employee in zip(files_path_customer, files_path_employee):
-                    for folder_name in ["./snapshots/"+file_path_customer, "./snapshots/"+file_path_employee]:
-                        for root, dirs, files in os.walk(folder_name):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                arcname = os.path.relpath(file_path, os.path.join(folder_name, '..'))
-                                zip_file.write(file_path, arcname)
-            zip_create_time = time.time() - zip_create_start
-            logger.info(f"[TIMING] backup_all - Zip file creation time: {zip_create_time:.3f}s")
-            
-            background_tasks.add_task(os.remove, f'./{zipfile_name}')
-            
-            total_time = time.time() - backup_all_start_time
-            logger.info(f"[TIMING] backup_all - Total successful backup all time: {total_time:.3f}s")
-            
-            return FileResponse(f'./{zipfile_name}', media_type='application/zip', filename=zipfile_name)
-        except Exception as e:
-            total_time = time.time() - backup_all_start_time
-            logger.info(f"[TIMING] backup_all - Total backup all time (error): {total_time:.3f}s")
-            return JSONResponse(status_code=500, content={
-                'status': 2,
-                'message': str(e)
-            })
+            # Get collections list (cached for a short TTL)
+            with _timer("get_collections"):
+                clts = await self._get_collections_cached()
+            logger.info(f"backup_all - Collections list retrieved: {clts}")
+
+            # Organize collections by store in a single pass. Grouping by
+            # store_id instead of pairing separate customer/employee lists means
+            # stores with only one of the two collections still get backed up.
+            by_store = defaultdict(dict)
+            for clt in clts:
+                store, _, kind = clt.rpartition('_')
+                if kind in ('Customers', 'Employees'):
+                    by_store[store][kind] = clt
+            collections = [clt for kinds in by_store.values() for clt in kinds.values()]
+            logger.info(f"backup_all - Collections to backup: {collections}")
+
+            # Create all snapshots concurrently
+            with _timer("snapshot_create"):
+                results = await asyncio.gather(
+                    *(self.database_client.create_snapshot(collection_name) for collection_name in collections),
+                    return_exceptions=True
+                )
+                for collection_name, result in zip(collections, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"backup_all - Snapshot failed for {collection_name}: {result}")
+
+            time_save = datetime.datetime.now().strftime("%Y_%m_%d_")
+            zipfile_name = f'snapshots_{time_save}.zip'
 
-    async def recover_db(self, file) -> JSONResponse:
+            try:
+                # Stream the archive as it is built instead of staging the
+                # whole zip on disk first
+                folders = ["./snapshots/" + clt for clt in collections]
+                return StreamingResponse(
+                    _stream_zip(folders),
+                    media_type='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{zipfile_name}"'}
+                )
+            except Exception as e:
+                logger.error(f"backup_all - Error: {str(e)}")
+                return ORJSONResponse(status_code=500, content={
+                    'status': 2,
+                    'message': str(e)
+                })
+        finally:
+            _timing_flush("backup_all")
+
+    async def recover_db(self, file) -> ORJSONResponse:
         """
         Recover database from backup file.
         
@@ -1052,102 +1275,91 @@ class FaceService:
             file: ZIP backup file to restore from
             
         Returns:
-            JSONResponse with recovery status
+            JSON response with recovery status
         """
         
-        recover_start_time = time.time()
-        logger.info("[TIMING] recover_db - Starting database recovery")
-        
+        _timing_start()
+        logger.info("recover_db - Starting database recovery")
+
         try:
             # Validate file format
-            validation_start = time.time()
             if not file.filename.endswith('.zip'):
-                total_time = time.time() - recover_start_time
-                logger.info(f"[TIMING] recover_db - Total recovery time (invalid format): {total_time:.3f}s")
                 raise HTTPException(status_code=400, detail="Invalid file format. Please upload a zip file.")
-            validation_time = time.time() - validation_start
-            logger.info(f"[TIMING] recover_db - File validation time: {validation_time:.3f}s")
-
-            # Save uploaded file
-            file_save_start = time.time()
-            temp_zip_path = f"./snapshots/{file.filename}"
-            with open(temp_zip_path, "wb") as buffer:
-                buffer.write(await file.read())
-            file_save_time = time.time() - file_save_start
-            logger.info(f"[TIMING] recover_db - File save time: {file_save_time:.3f}s")
-            
-            # Extract zip file
-            extract_start = time.time()
-            extract_name = f"extracted_{os.path.splitext(file.filename)[0]}"
-            extract_dir = f"snapshots/{extract_name}"
-            with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
-            os.remove(temp_zip_path)
-            extract_time = time.time() - extract_start
-            logger.info(f"[TIMING] recover_db - File extraction time: {extract_time:.3f}s")
+
+            # Save uploaded file in 1 MiB chunks; reading the whole upload at
+            # once would hold a multi-GB backup in memory.
+            with _timer("file_save"):
+                temp_zip_path = f"./snapshots/{file.filename}"
+                with open(temp_zip_path, "wb") as buffer:
+                    while chunk := await file.read(1 << 20):
+                        buffer.write(chunk)
+
+            # Extract zip file off the event loop (extractall is synchronous
+            # and CPU/disk bound)
+            with _timer("extract"):
+                extract_name = f"extracted_{os.path.splitext(file.filename)[0]}"
+                extract_dir = f"snapshots/{extract_name}"
+                with zipfile.ZipFile(temp_zip_path, 'r') as zip_ref:
+                    await asyncio.to_thread(zip_ref.extractall, extract_dir)
+                os.remove(temp_zip_path)
 
             # Process extracted files
-            process_start = time.time()
             extracted_files = []
             folders = os.listdir(extract_dir)
             for root, dirs, files in os.walk(extract_dir):
                 for name in files:
                     extracted_files.append(os.path.join(root, name))
-            
-            logger.info(f"[TIMING] recover_db - Extracted files: {extracted_files}")
-            # Recover snapshots
-            recover_snapshots_start = time.time()
+
+            logger.info(f"recover_db - Extracted files: {extracted_files}")
+            # Recover snapshots. Each collection restores independently, so
+            # run them concurrently (bounded so Qdrant isn't overloaded)
+            # instead of one at a time.
+            snapshots = []
             for folder in folders:
                 for snapshot_name in os.listdir(os.path.join(extract_dir, folder)):
                     if snapshot_name.endswith('.snapshot'):
-                        snapshot_path = os.path.join(extract_name, folder, snapshot_name)
-                        logger.info(f"[TIMING] recover_db - Recovering snapshot: {snapshot_path}")
-                        success = await self.database_client.recover_snapshot(
-                            collection_name=folder,
-                            snapshot_name=snapshot_path
-                        )
-                        
-                        if not success:
-                            total_time = time.time() - recover_start_time
-                            logger.info(f"[TIMING] recover_db - Total recovery time (snapshot error): {total_time:.3f}s")
-                            shutil.rmtree(extract_dir)
-                            return JSONResponse(status_code=500, content={
-                                'status': 2,
-                                'message': f"Error recovering snapshot {snapshot_name}"
-                            })
-            recover_snapshots_time = time.time() - recover_snapshots_start
-            logger.info(f"[TIMING] recover_db - Snapshots recovery time: {recover_snapshots_time:.3f}s")
-            
-            process_time = time.time() - process_start
-            logger.info(f"[TIMING] recover_db - File processing time: {process_time:.3f}s")
-            
-            # Cleanup
-            cleanup_start = time.time()
-            try:
-                shutil.rmtree(extract_dir)
-                del extracted_files, folders, folder, snapshot_name, json_post, check
-                gc.collect()
-                cleanup_time = time.time() - cleanup_start
-                logger.info(f"[TIMING] recover_db - Cleanup time: {cleanup_time:.3f}s")
-                
-                total_time = time.time() - recover_start_time
-                logger.info(f"[TIMING] recover_db - Total successful recovery time: {total_time:.3f}s")
-                
-                return JSONResponse(status_code=200, content={
-                    'status': 1,
-                    'message': "Recover database successfully"
-                })
-            except:
-                total_time = time.time() - recover_start_time
-                logger.info(f"[TIMING] recover_db - Total recovery time (cleanup warning): {total_time:.3f}s")
-                return JSONResponse(status_code=200, content={
-                    'status': 1,
-                    'message': "Recover database successfully"
-                })
+                        snapshots.append((folder, os.path.join(extract_name, folder, snapshot_name)))
+
+            recover_sem = asyncio.Semaphore(4)
+
+            async def recover_one(collection_name, snapshot_path):
+                async with recover_sem:
+                    logger.info(f"recover_db - Recovering snapshot: {snapshot_path}")
+                    return await self.database_client.recover_snapshot(
+                        collection_name=collection_name,
+                        snapshot_name=snapshot_path
+                    )
+
+            with _timer("recover_snapshots"):
+                results = await asyncio.gather(
+                    *(recover_one(folder, snapshot_path) for folder, snapshot_path in snapshots),
+                    return_exceptions=True
+                )
+            for (folder, snapshot_path), success in zip(snapshots, results):
+                if success is not True:
+                    await asyncio.to_thread(shutil.rmtree, extract_dir, ignore_errors=True)
+                    return ORJSONResponse(status_code=500, content={
+                        'status': 2,
+                        'message': f"Error recovering snapshot {os.path.basename(snapshot_path)}"
+                    })
+
+            # Cleanup in a worker thread: rmtree of a large snapshot tree
+            # would otherwise block the event loop
+            with _timer("cleanup"):
+                try:
+                    await asyncio.to_thread(shutil.rmtree, extract_dir, ignore_errors=True)
+                except Exception as cleanup_error:
+                    logger.warning(f"recover_db - Cleanup warning: {str(cleanup_error)}")
+
+            return ORJSONResponse(status_code=200, content={
+                'status': 1,
+                'message': "Recover database successfully"
+            })
         except Exception as e:
-            total_time = time.time() - recover_start_time
-            logger.info(f"[TIMING] recover_db - Total recovery time (error): {total_time:.3f}s")
-            return JSONResponse(status_code=500, content={
+            logger.error(f"recover_db - Error: {str(e)}")
+            return ORJSONResponse(status_code=500, content={
                 'status': 2,
                 'message': str(e)
             })
+        finally:
+            _timing_flush("recover_db")
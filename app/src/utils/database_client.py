@@ -1,13 +1,118 @@
 """Database client utilities for calling qdrant_database_FE API."""
 import logging
-from typing import List, Optional, Dict, Any
+import time
+from typing import List, Optional, Dict, Any, Tuple
+import base64
+import gzip
+import random
 import httpx
 import asyncio
+import numpy as np
+import orjson
 from config.logging import get_database_logger
 
 logger = get_database_logger()
 
 
+# HTTP/2 needs the optional h2 package; probe once so client creation can
+# multiplex requests over a few connections when it is available and fall
+# back to HTTP/1.1 keepalive when it is not.
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+# Gateway-style statuses worth retrying; 4xx and other app errors are not
+_RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with a little jitter."""
+    return min(0.05 * (2 ** attempt), 0.5) + random.random() * 0.05
+
+
+def _pack_embedding(vector_embedding) -> str:
+    """Pack an embedding into base64 float16 bytes for the wire.
+
+    Face embeddings are cosine-matched, so half precision is lossless in
+    practice; packed bytes are ~16 KB instead of the ~70 KB a 4096-dim
+    JSON float list costs to serialize and parse. The server also still
+    accepts plain float lists under vector_embedding.
+    """
+    arr = np.asarray(vector_embedding, dtype=np.float16)
+    return base64.b64encode(arr.tobytes()).decode("ascii")
+
+
+class _BatchCoalescer:
+    """Groups single-point inserts issued within a short window into one
+    insert_points_batch request per collection.
+
+    Concurrent request handlers each insert one point; under load dozens
+    of those land within a few milliseconds. Draining them into a batched
+    request amortizes the HTTP round-trip, while the max-wait window
+    keeps tail latency bounded when traffic is light.
+    """
+
+    def __init__(self, database_client, max_batch: int = 64, max_wait_ms: float = 10.0):
+        self._db = database_client
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    def submit(self, collection_name: str, item: Dict[str, Any]) -> "asyncio.Future":
+        """Queue one insert and return a future resolving to its success."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((collection_name, item, future))
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        return future
+
+    async def _run(self):
+        while True:
+            try:
+                first = await asyncio.wait_for(self._queue.get(), timeout=self._max_wait * 10)
+            except asyncio.TimeoutError:
+                # An item may have been enqueued between the timeout and
+                # this check; submit() saw a live worker then, so exiting
+                # now would orphan it. The check-and-return runs without
+                # awaits, so no further enqueue can slip in between.
+                if not self._queue.empty():
+                    continue
+                # Idle; the next submit starts a fresh worker
+                return
+
+            loop = asyncio.get_running_loop()
+            batch = [first]
+            deadline = loop.time() + self._max_wait
+            while len(batch) < self._max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            by_collection: Dict[str, List] = {}
+            for collection_name, item, future in batch:
+                by_collection.setdefault(collection_name, []).append((item, future))
+
+            for collection_name, entries in by_collection.items():
+                try:
+                    results = await self._db.insert_points_batch(
+                        collection_name, [item for item, _ in entries]
+                    )
+                except Exception as e:
+                    logger.error(f"Coalesced insert failed for {collection_name}: {str(e)}")
+                    results = [False] * len(entries)
+                for (_, future), ok in zip(entries, results):
+                    if not future.done():
+                        future.set_result(bool(ok))
+
+
 class DatabaseClient:
     """HTTP client for qdrant_database_FE API operations."""
     
@@ -17,7 +122,123 @@ class DatabaseClient:
         self.api_port = api_port
         self.base_url = f"http://{api_host}:{api_port}"
         self.timeout = httpx.Timeout(30.0)
+        self._client: Optional[httpx.AsyncClient] = None
+        # Stores whose collections have already been verified this process
+        self._verified_stores: set = set()
+        self._store_locks: Dict[str, asyncio.Lock] = {}
+        # Known collections with a short TTL; the list only changes when a
+        # store is provisioned, so steady-state existence checks skip the
+        # round-trip entirely
+        self._collections_cache: Tuple[float, set] = (0.0, set())
+        self._collections_cache_ttl = 60.0
+        self._collections_lock = asyncio.Lock()
+        # Coalesces concurrent single-point inserts into batched requests
+        self._insert_coalescer = _BatchCoalescer(self)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared AsyncClient, creating it on first use.
+
+        A single long-lived client keeps connections alive between calls,
+        so the hot insert/search paths skip the per-request TCP handshake.
+        """
+        if self._client is None or self._client.is_closed:
+            if _HTTP2_AVAILABLE:
+                # Many in-flight requests multiplex over a handful of
+                # sockets; httpx negotiates back to HTTP/1.1 when the
+                # server does not speak h2
+                self._client = httpx.AsyncClient(
+                    http2=True,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+                )
+            else:
+                self._client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=100)
+                )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared AsyncClient. Call once at application shutdown."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
     
+    async def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        attempts: int = 3,
+        idempotent: bool = True,
+        **kwargs
+    ) -> httpx.Response:
+        """Send a request, retrying transient failures with backoff.
+
+        Only transport errors and gateway statuses (502/503/504) are
+        retried; 4xx responses surface immediately. Non-idempotent calls
+        (idempotent=False) only retry failures from before the request
+        reached the server (connect errors) — timeouts and mid-stream
+        transport errors are re-raised, since the first attempt may have
+        landed.
+        """
+        client = self._get_client()
+        for attempt in range(attempts):
+            try:
+                response = await client.request(method, url, **kwargs)
+                if response.status_code in _RETRYABLE_STATUS and attempt < attempts - 1:
+                    await asyncio.sleep(_backoff_delay(attempt))
+                    continue
+                return response
+            except httpx.TimeoutException:
+                if not idempotent or attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt))
+            except httpx.ConnectError:
+                # The request never reached the server, so retrying is
+                # safe regardless of idempotency
+                if attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt))
+            except httpx.TransportError:
+                # Read/write/protocol errors can occur after the server
+                # applied the request; don't replay non-idempotent calls
+                if not idempotent or attempt == attempts - 1:
+                    raise
+                await asyncio.sleep(_backoff_delay(attempt))
+
+    async def _post_json(self, url: str, payload: Dict[str, Any], idempotent: bool = True) -> httpx.Response:
+        """POST a JSON body serialized with orjson.
+
+        httpx's json= path goes through the stdlib encoder; orjson is
+        several times faster on the vector payloads the hot endpoints
+        carry. Bodies over 4 KB are gzipped at level 1 — the database API
+        decompresses them transparently.
+        """
+        body = orjson.dumps(payload)
+        headers = {"content-type": "application/json"}
+        if len(body) > 4096:
+            body = gzip.compress(body, compresslevel=1)
+            headers["content-encoding"] = "gzip"
+        return await self._request_with_retry(
+            "POST",
+            url,
+            idempotent=idempotent,
+            content=body,
+            headers=headers
+        )
+
+    async def _cached_collections(self) -> set:
+        """Set of known collections, refreshed at most once per TTL."""
+        ts, cached = self._collections_cache
+        if time.monotonic() - ts < self._collections_cache_ttl:
+            return cached
+        async with self._collections_lock:
+            ts, cached = self._collections_cache
+            if time.monotonic() - ts < self._collections_cache_ttl:
+                return cached
+            collections = set(await self.get_collections())
+            self._collections_cache = (time.monotonic(), collections)
+            return collections
+
     async def get_collections(self) -> List[str]:
         """
         Get list of all collections.
@@ -26,17 +247,17 @@ class DatabaseClient:
             List of collection names
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/get_collections")
-                response.raise_for_status()
-                
-                result = response.json()
-                if result.get("status") == 200:
-                    return result.get("collections", [])
-                else:
-                    logger.error(f"Failed to get collections: {result}")
-                    return []
-                    
+            client = self._get_client()
+            response = await client.get(f"{self.base_url}/get_collections")
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            if result.get("status") == 200:
+                return result.get("collections", [])
+            else:
+                logger.error(f"Failed to get collections: {result}")
+                return []
+
         except Exception as e:
             logger.error(f"Error getting collections: {str(e)}")
             return []
@@ -52,17 +273,16 @@ class DatabaseClient:
             bool: True if created successfully or already exists
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {"collection_name": collection_name}
-                response = await client.post(
-                    f"{self.base_url}/create_collection", 
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                # Both 200 (existed) and 201 (created) are success cases
-                return response.status_code in [200, 201]
-                
+            payload = {"collection_name": collection_name}
+            response = await self._post_json(f"{self.base_url}/create_collection", payload)
+            response.raise_for_status()
+
+            # Both 200 (existed) and 201 (created) are success cases
+            success = response.status_code in [200, 201]
+            if success:
+                self._collections_cache[1].add(collection_name)
+            return success
+
         except Exception as e:
             logger.error(f"Error creating collection '{collection_name}': {str(e)}")
             return False
@@ -79,7 +299,7 @@ class DatabaseClient:
             bool: True if collection exists or was created successfully
         """
         try:
-            collections = await self.get_collections()
+            collections = await self._cached_collections()
             if collection_name in collections:
                 logger.info(f"Collection '{collection_name}' already exists")
                 return True
@@ -105,20 +325,40 @@ class DatabaseClient:
         Returns:
             bool: True if both collections exist or were created successfully
         """
+        if store_id in self._verified_stores:
+            return True
+
         try:
-            customer_collection = f"{store_id}_Customers"
-            employee_collection = f"{store_id}_Employees"
-            
-            # Create both collections
-            customer_success = await self.ensure_collection_exists(customer_collection)
-            employee_success = await self.ensure_collection_exists(employee_collection)
-            
-            return customer_success and employee_success
-            
+            # Per-store lock coalesces the first burst of concurrent requests
+            lock = self._store_locks.setdefault(store_id, asyncio.Lock())
+            async with lock:
+                if store_id in self._verified_stores:
+                    return True
+
+                customer_collection = f"{store_id}_Customers"
+                employee_collection = f"{store_id}_Employees"
+
+                # One cached list fetch, then create whatever is missing
+                # concurrently
+                existing = await self._cached_collections()
+                to_create = [c for c in (customer_collection, employee_collection) if c not in existing]
+                for collection_name in to_create:
+                    logger.info(f"Creating collection '{collection_name}'")
+                results = await asyncio.gather(*(self.create_collection(c) for c in to_create))
+
+                success = all(results)
+                if success:
+                    self._verified_stores.add(store_id)
+                return success
+
         except Exception as e:
             logger.error(f"Error ensuring collections exist for store {store_id}: {str(e)}")
             return False
     
+    def is_store_verified(self, store_id: str) -> bool:
+        """Check whether a store's collections were already verified."""
+        return store_id in self._verified_stores
+
     async def insert_point(
         self, 
         collection_name: str, 
@@ -142,29 +382,133 @@ class DatabaseClient:
         Returns:
             bool: True if inserted successfully
         """
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "collection_name": collection_name,
+        if not is_update_id:
+            # Plain inserts ride the coalescer so bursts of concurrent
+            # single-point calls collapse into one batched request;
+            # updates need the dedicated endpoint's lookup semantics.
+            try:
+                return await self._insert_coalescer.submit(collection_name, {
                     "vector_embedding": vector_embedding,
                     "id": id,
                     "name": name,
-                    "store_id": store_id,
-                    "is_update_id": is_update_id
-                }
-                
-                response = await client.post(
-                    f"{self.base_url}/insert_point", 
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                return response.status_code == 201
+                    "store_id": store_id
+                })
+            except Exception as e:
+                logger.error(f"Error inserting point {id}: {str(e)}")
+                return False
+
+        return await self._insert_point_single(
+            collection_name, vector_embedding, id, name, store_id, is_update_id
+        )
+
+    async def _insert_point_single(
+        self,
+        collection_name: str,
+        vector_embedding: List[float],
+        id: str,
+        name: str,
+        store_id: str,
+        is_update_id: bool = False
+    ) -> bool:
+        """POST one point to /insert_point, bypassing the coalescer."""
+        try:
+            payload = {
+                "collection_name": collection_name,
+                "vector_embedding_b64": _pack_embedding(vector_embedding),
+                "vector_dtype": "float16",
+                "id": id,
+                "name": name,
+                "store_id": store_id,
+                "is_update_id": is_update_id
+            }
+
+            response = await self._post_json(f"{self.base_url}/insert_point", payload, idempotent=False)
+            response.raise_for_status()
+
+            return response.status_code == 201
                 
         except Exception as e:
             logger.error(f"Error inserting point {id}: {str(e)}")
             return False
     
+    @staticmethod
+    def _batch_route_missing(response: httpx.Response) -> bool:
+        """True when a 404/405 means the batch route itself is absent.
+
+        The database service reports application errors (unknown
+        collection, bad payload) as 404 with a JSON "message" body;
+        FastAPI answers for routes it does not have with a bare
+        {"detail": ...} body, which marks an older service worth
+        retrying point by point.
+        """
+        if response.status_code == 405:
+            return True
+        if response.status_code != 404:
+            return False
+        try:
+            body = orjson.loads(response.content)
+        except Exception:
+            return True
+        return "message" not in body
+
+    async def insert_points_batch(
+        self,
+        collection_name: str,
+        items: List[Dict[str, Any]]
+    ) -> List[bool]:
+        """
+        Insert several points into a collection in one request.
+
+        Args:
+            collection_name: Name of the collection
+            items: Dicts with vector_embedding, id, name and store_id
+
+        Returns:
+            List[bool]: Per-item success flags, in input order
+        """
+        if not items:
+            return []
+
+        try:
+            payload = {
+                "collection_name": collection_name,
+                "points": [
+                    {
+                        "vector_embedding_b64": _pack_embedding(item["vector_embedding"]),
+                        "vector_dtype": "float16",
+                        "id": item["id"],
+                        "name": item["name"],
+                        "store_id": item["store_id"]
+                    }
+                    for item in items
+                ]
+            }
+
+            response = await self._post_json(f"{self.base_url}/insert_points", payload, idempotent=False)
+
+            if self._batch_route_missing(response):
+                # Database service without the batch endpoint; fall back
+                # to per-point inserts (direct, so they cannot re-enter
+                # the coalescer) and report each point's own outcome
+                return list(await asyncio.gather(*(
+                    self._insert_point_single(
+                        collection_name=collection_name,
+                        vector_embedding=item["vector_embedding"],
+                        id=item["id"],
+                        name=item["name"],
+                        store_id=item["store_id"],
+                        is_update_id=False
+                    )
+                    for item in items
+                )))
+
+            response.raise_for_status()
+            return [response.status_code == 201] * len(items)
+
+        except Exception as e:
+            logger.error(f"Error batch inserting points: {str(e)}")
+            return [False] * len(items)
+
     async def store_embedding(
         self, 
         collection_name: str, 
@@ -220,39 +564,63 @@ class DatabaseClient:
         Returns:
             List of matching results with metadata
         """
+        # Thin wrapper over the batched endpoint so single and multi-vector
+        # searches share one code path on both sides.
+        results = await self.search_point_batch(
+            collection_name=collection_name,
+            vector_embeddings=[vector_embedding],
+            store_id=store_id
+        )
+        if results and results[0]:
+            return results[0]
+        logger.info(f"No points found in {collection_name}")
+        return []
+    
+    async def search_point_batch(
+        self,
+        collection_name: str,
+        vector_embeddings: List[List[float]],
+        store_id: str
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search several embeddings against one collection in a single request.
+
+        Args:
+            collection_name: Name of the collection to search
+            vector_embeddings: Query face embedding vectors
+            store_id: Store ID for filtering
+
+        Returns:
+            One result list per query embedding, in input order
+        """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "collection_name": collection_name,
-                    "vector_embedding": vector_embedding,
-                    "store_id": store_id
-                }
-                
-                response = await client.post(
-                    f"{self.base_url}/search_point", 
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                if result.get("message") == "Point found":
-                    # Convert API response format to expected format
-                    search_results = []
-                    for score, payload_data in result.get("data", []):
-                        search_results.append({
-                            'id': payload_data.get('id'),
-                            'score': score,
-                            'payload': payload_data
-                        })
-                    return search_results
-                else:
-                    logger.info(f"No points found in {collection_name}")
-                    return []
-                
+            payload = {
+                "collection_name": collection_name,
+                "vector_embeddings_b64": [_pack_embedding(v) for v in vector_embeddings],
+                "vector_dtype": "float16",
+                "store_id": store_id
+            }
+
+            response = await self._post_json(f"{self.base_url}/search_point_batch", payload)
+            response.raise_for_status()
+
+            result = orjson.loads(response.content)
+            batched_results = []
+            for per_query in result.get("data", []):
+                batched_results.append([
+                    {
+                        'id': payload_data.get('id'),
+                        'score': score,
+                        'payload': payload_data
+                    }
+                    for score, payload_data in per_query
+                ])
+            return batched_results
+
         except Exception as e:
-            logger.error(f"Error searching points: {str(e)}")
-            return []
-    
+            logger.error(f"Error batch searching points: {str(e)}")
+            return [[] for _ in vector_embeddings]
+
     async def search_similar_faces(
         self, 
         collection_name: str, 
@@ -300,32 +668,26 @@ class DatabaseClient:
             bool: True if deleted successfully
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "collection_name": f"{collection_name}",
-                    "id": id
-                }
-                logger.info(f"Preparing to delete point {id} from {collection_name}")
-                
-                
-                response = await client.request(
-                    method="DELETE",
-                    url=f"{self.base_url}/delete_point", 
-                    json=payload
-                )
-                
-                # response = await client.post(
-                #     f"{self.base_url}/delete_point", 
-                #     json=payload
-                # )
-                
-                logger.info(f"Deleting point {id} from {collection_name}")
-                logger.debug(f"Delete response: {response.text}")
-                
-                response.raise_for_status()
-                
-                return response.status_code == 200
-                
+            payload = {
+                "collection_name": f"{collection_name}",
+                "id": id
+            }
+            logger.info(f"Preparing to delete point {id} from {collection_name}")
+
+            response = await self._request_with_retry(
+                "DELETE",
+                f"{self.base_url}/delete_point",
+                content=orjson.dumps(payload),
+                headers={"content-type": "application/json"}
+            )
+
+            logger.info(f"Deleting point {id} from {collection_name}")
+            logger.debug(f"Delete response: {response.text}")
+
+            response.raise_for_status()
+
+            return response.status_code == 200
+
         except Exception as e:
             logger.error(f"Error deleting point {id}: {str(e)}")
             return False
@@ -354,14 +716,14 @@ class DatabaseClient:
             Snapshot information or None if failed
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/create_snapshot/{collection_name}"
-                )
-                response.raise_for_status()
-                
-                return response.json()
-                
+            client = self._get_client()
+            response = await client.get(
+                f"{self.base_url}/create_snapshot/{collection_name}"
+            )
+            response.raise_for_status()
+
+            return orjson.loads(response.content)
+
         except Exception as e:
             logger.error(f"Error creating snapshot for {collection_name}: {str(e)}")
             return None
@@ -378,20 +740,16 @@ class DatabaseClient:
             bool: True if recovered successfully
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload = {
-                    "collection_name": collection_name,
-                    "snapshot_name": snapshot_name
-                }
-                
-                response = await client.post(
-                    f"{self.base_url}/recover_snapshot", 
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                return response.status_code == 200
-                
+            payload = {
+                "collection_name": collection_name,
+                "snapshot_name": snapshot_name
+            }
+
+            response = await self._post_json(f"{self.base_url}/recover_snapshot", payload)
+            response.raise_for_status()
+
+            return response.status_code == 200
+
         except Exception as e:
             logger.error(f"Error recovering snapshot {snapshot_name}: {str(e)}")
             return False, str(e)
@@ -407,14 +765,14 @@ class DatabaseClient:
             bool: True if recovered successfully
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    f"{self.base_url}/recover_snapshot_local/{collection_name}"
-                )
-                response.raise_for_status()
-                
-                return response.status_code == 200
-                
+            client = self._get_client()
+            response = await client.get(
+                f"{self.base_url}/recover_snapshot_local/{collection_name}"
+            )
+            response.raise_for_status()
+
+            return response.status_code == 200
+
         except Exception as e:
             logger.error(f"Error recovering local snapshot for {collection_name}: {str(e)}")
             return False
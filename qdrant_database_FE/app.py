@@ -1,11 +1,17 @@
 from fastapi import FastAPI, status 
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from typing import Union, List
 from qdrant_client import AsyncQdrantClient, models
 from qdrant_client.http import models
 from qdrant_client.http.models import Distance, VectorParams, PointStruct
 from uuid import uuid4
+import asyncio
+import base64
+import gzip
+import logging
+import numpy as np
 # import torch
 # from fastapi.middleware.cors import CORSMiddleware
 
@@ -31,9 +37,53 @@ tags_metadata = [
         "description": "APIs for point"
     }
 ]
+class GzipRequestMiddleware:
+    """Transparently decompress gzip-encoded request bodies.
+
+    Starlette's GZipMiddleware only compresses responses; this is the
+    request-side counterpart for clients that gzip large vector payloads.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = scope.get("headers") or []
+            if (b"content-encoding", b"gzip") in [(k.lower(), v.lower()) for k, v in headers]:
+                body = b""
+                more_body = True
+                while more_body:
+                    message = await receive()
+                    body += message.get("body", b"")
+                    more_body = message.get("more_body", False)
+                body = gzip.decompress(body)
+                # Drop the encoding header so downstream sees a plain body
+                scope = dict(scope)
+                scope["headers"] = [
+                    (k, v) for k, v in headers
+                    if k.lower() not in (b"content-encoding", b"content-length")
+                ] + [(b"content-length", str(len(body)).encode())]
+
+                sent = False
+
+                async def replay():
+                    nonlocal sent
+                    if sent:
+                        return {"type": "http.disconnect"}
+                    sent = True
+                    return {"type": "http.request", "body": body, "more_body": False}
+
+                await self.app(scope, replay, send)
+                return
+        await self.app(scope, receive, send)
+
+
 # from qdrant_db import *
 # docs_url=None, redoc_url=None
-app = FastAPI(openapi_tags=tags_metadata)
+app = FastAPI(openapi_tags=tags_metadata, default_response_class=ORJSONResponse)
+app.add_middleware(GzipRequestMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=4096)
 
 logger.info("Database API service starting...")
 
@@ -42,6 +92,12 @@ QDRANT_PORT = int( os.getenv("QDRANT_PORT", "6333"))
 THRESHOLD_PASS = 0.54
 THRESHOLD_SEARCH = 0.54
 
+# HNSW build parameters, overridable per deployment. m=24 buys recall on
+# the 4096-dim face vectors (missed recall = false negatives) at similar
+# query cost to the old m=16.
+HNSW_M = int(os.getenv("HNSW_M", "24"))
+HNSW_EFC = int(os.getenv("HNSW_EFC", "256"))
+
 logger.info(f"Connecting to Qdrant at {QDRANT_HOST}:{QDRANT_PORT}")
 client = AsyncQdrantClient(host=QDRANT_HOST, port=QDRANT_PORT, timeout=300)
 
@@ -51,6 +107,8 @@ class CreateCollection(BaseModel):
 class InsertPoint(BaseModel):
     collection_name: Union[str, None] = ""
     vector_embedding: Union[List[int], List[float]] = None
+    vector_embedding_b64: Union[str, None] = None
+    vector_dtype: Union[str, None] = None
     id: Union[str, None] = ""
     name: Union[str, None] = ""
     store_id: Union[str, None] = ""
@@ -59,6 +117,27 @@ class InsertPoint(BaseModel):
 class SearchPoint(BaseModel):
     collection_name: Union[str, None] = ""
     vector_embedding: Union[List[int], List[float]] = None
+    vector_embedding_b64: Union[str, None] = None
+    vector_dtype: Union[str, None] = None
+    store_id: Union[str, None] = ""
+
+class InsertPointItem(BaseModel):
+    vector_embedding: Union[List[int], List[float]] = None
+    vector_embedding_b64: Union[str, None] = None
+    vector_dtype: Union[str, None] = None
+    id: Union[str, None] = ""
+    name: Union[str, None] = ""
+    store_id: Union[str, None] = ""
+
+class InsertPointsBatch(BaseModel):
+    collection_name: Union[str, None] = ""
+    points: Union[List[InsertPointItem], None] = None
+
+class SearchPointBatch(BaseModel):
+    collection_name: Union[str, None] = ""
+    vector_embeddings: Union[List[List[int]], List[List[float]], None] = None
+    vector_embeddings_b64: Union[List[str], None] = None
+    vector_dtype: Union[str, None] = None
     store_id: Union[str, None] = ""
 
 class DeletePoint(BaseModel):
@@ -69,9 +148,118 @@ class RecoverSnapshot(BaseModel):
     collection_name: Union[str, None] = ""
     snapshot_name: Union[str, None] = ""
 
+def _decode_embedding(b64_value, dtype, fallback):
+    """Unpack a base64-packed embedding, falling back to the JSON float list.
+
+    Packed float16 vectors are ~16 KB on the wire instead of the ~70 KB a
+    4096-dim JSON float list costs; old clients keep sending plain lists.
+    """
+    if not b64_value:
+        return fallback
+    try:
+        np_dtype = np.dtype(dtype or "float16")
+        # O(1) sanity check: a 4096-dim vector has a fixed base64 length,
+        # so wrong-sized bodies are rejected before the decode
+        if len(b64_value) != 4 * ((4096 * np_dtype.itemsize + 2) // 3):
+            logger.error(
+                "Packed embedding has unexpected length %d for dtype %s",
+                len(b64_value), np_dtype.name,
+            )
+            return None
+        arr = np.frombuffer(base64.b64decode(b64_value), dtype=np_dtype)
+        return arr.astype(np.float32, copy=False).tolist()
+    except Exception as e:
+        logger.error(f"Failed to decode packed embedding: {str(e)}")
+        return fallback
+
+# Known collections, refreshed lazily on a miss. Collections only change
+# through this service's create/delete/recover handlers, so the hot
+# insert/search/delete paths get an O(1) membership check instead of a
+# get_collections round-trip per request.
+_known_collections: set = set()
+_known_collections_lock = asyncio.Lock()
+
+
+# Cached date part for time_created strings; strftime's locale machinery
+# only reruns when the day rolls over.
+_today_cache = {"day": None, "str": ""}
+
+
+def _timestamp() -> str:
+    """Build the time_created string with the date part cached per day."""
+    now = datetime.datetime.now()
+    day = now.date()
+    if day != _today_cache["day"]:
+        _today_cache["day"] = day
+        _today_cache["str"] = day.strftime("%Y/%m/%d")
+    return f"{_today_cache['str']} {now:%H:%M:%S}"
+
+
+async def _create_payload_indexes(collection_name):
+    """Keyword-index the payload fields every filter touches.
+
+    Searches filter on store_id and _get_points scrolls on id; without
+    these indexes Qdrant falls back to linear payload scans per filtered
+    query.
+    """
+    for field_name in ("store_id", "id"):
+        await client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=models.PayloadSchemaType.KEYWORD,
+        )
+
+
+# Collection build parameters shared by create_collection and the
+# recovery path; built once instead of per request.
+_VECTORS_CONFIG = VectorParams(size=4096, distance=Distance.COSINE, on_disk=True)
+_HNSW_CONFIG = models.HnswConfigDiff(
+    m=HNSW_M,
+    ef_construct=HNSW_EFC,
+    full_scan_threshold=10000,
+)
+_OPTIMIZERS_CONFIG = models.OptimizersConfigDiff(
+    indexing_threshold=20000,
+    max_optimization_threads=os.cpu_count(),
+)
+_QUANTIZATION_CONFIG = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(
+        type=models.ScalarType.INT8,
+        quantile=0.99,
+        always_ram=True,
+    )
+)
+
+
+async def _ensure_collection(collection_name):
+    """Create the collection and its payload indexes if missing.
+
+    Returns True when a new collection was created.
+    """
+    if await _check_exist(collection_name):
+        return False
+    await client.create_collection(
+        collection_name=collection_name,
+        vectors_config=_VECTORS_CONFIG,
+        hnsw_config=_HNSW_CONFIG,
+        optimizers_config=_OPTIMIZERS_CONFIG,
+        quantization_config=_QUANTIZATION_CONFIG,
+    )
+    await _create_payload_indexes(collection_name)
+    _known_collections.add(collection_name)
+    return True
+
+
 async def _check_exist(collection_name):
-    collections = await client.get_collections()
-    return collection_name in [c.name for c in collections.collections]
+    if collection_name in _known_collections:
+        return True
+    async with _known_collections_lock:
+        if collection_name in _known_collections:
+            return True
+        collections = await client.get_collections()
+        _known_collections.clear()
+        _known_collections.update(c.name for c in collections.collections)
+    return collection_name in _known_collections
 
 async def _get_points(collection_name, id):
     try:
@@ -93,6 +281,32 @@ async def _get_points(collection_name, id):
         return None
 
 
+@app.on_event("startup")
+async def warm_hnsw_graphs():
+    """Prefault HNSW graph pages so the first real query hits warm cache.
+
+    Collections are created with on_disk=True, so a cold search pays for
+    pulling entry-point pages from disk; one dummy search per collection
+    at startup eats that cost before traffic arrives.
+    """
+    try:
+        collections = await client.get_collections()
+        _known_collections.update(c.name for c in collections.collections)
+        for collection_name in _known_collections:
+            try:
+                await client.search(
+                    collection_name=collection_name,
+                    query_vector=[0.0] * 4096,
+                    limit=1,
+                    search_params=models.SearchParams(hnsw_ef=64, exact=False),
+                )
+            except Exception as e:
+                logger.warning(f"Warmup search failed for {collection_name}: {str(e)}")
+        logger.info(f"Warmed {len(_known_collections)} collection(s)")
+    except Exception as e:
+        logger.warning(f"Collection warmup skipped: {str(e)}")
+
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
@@ -109,35 +323,41 @@ async def get_collections():
 async def create_collection(data:CreateCollection):
     collection_name= data.collection_name
     if collection_name is None:
-        return JSONResponse(status_code=404, content={"message": "Collection name not found!"})
-    if not await _check_exist(collection_name):
-        await client.create_collection(
-            collection_name=collection_name,
-            vectors_config=VectorParams(size=4096, distance=Distance.COSINE, on_disk=True),
-            hnsw_config=models.HnswConfigDiff(
-                m=16,
-                ef_construct=200,
-            ),
-            quantization_config=models.BinaryQuantization(
-                binary=models.BinaryQuantizationConfig(always_ram=True)
-            )
-        )
-        await client.create_snapshot(collection_name=collection_name)
-        return JSONResponse(status_code=201, content={"message": "Collection created"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found!"})
+    if await _ensure_collection(collection_name):
+        snapshot_info = await client.create_snapshot(collection_name=collection_name)
+        _last_snapshot[collection_name] = snapshot_info.name
+        return ORJSONResponse(status_code=201, content={"message": "Collection created"})
     else:
-        return JSONResponse(status_code=200, content={"message": "Collection existed"})
+        return ORJSONResponse(status_code=200, content={"message": "Collection existed"})
     
+# Last snapshot name per collection, so rotation can skip the
+# list_snapshots round-trip and delete + create in one gather.
+_last_snapshot: dict = {}
+
+
 @app.get('/create_snapshot/{collection_name}', tags=["Snapshot"])
 async def create_snapshot(collection_name):
     try:
-        snapshots = await client.list_snapshots(collection_name=f"{collection_name}")
-        for snapshot in snapshots:
-            await client.delete_snapshot(
-                collection_name=collection_name, snapshot_name=snapshot.name
+        cached_name = _last_snapshot.get(collection_name)
+        if cached_name is not None:
+            _, snapshot_info = await asyncio.gather(
+                client.delete_snapshot(
+                    collection_name=collection_name, snapshot_name=cached_name
+                ),
+                client.create_snapshot(collection_name=collection_name),
             )
-        snapshot_info = await client.create_snapshot(collection_name=collection_name)
+        else:
+            snapshots = await client.list_snapshots(collection_name=f"{collection_name}")
+            for snapshot in snapshots:
+                await client.delete_snapshot(
+                    collection_name=collection_name, snapshot_name=snapshot.name
+                )
+            snapshot_info = await client.create_snapshot(collection_name=collection_name)
+        _last_snapshot[collection_name] = snapshot_info.name
         return snapshot_info
     except Exception as e:
+        _last_snapshot.pop(collection_name, None)
         return str(e)
 
 @app.get('/all_snapshots/{collection_name}', tags=["Snapshot"])
@@ -157,43 +377,34 @@ async def recover_snapshot_local(collection_name):
             await client.recover_snapshot(
                 collection_name=collection_name, location=f"file:///qdrant/snapshots/{collection_name}/{snapshot.name}"
             )
-            return JSONResponse(status_code=200, content={"message": "Recover snapshot successfully", 
+            return ORJSONResponse(status_code=200, content={"message": "Recover snapshot successfully", 
                     "Path": f"file:///qdrant/snapshots/{collection_name}/{snapshot.name}"})
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=404, 
                 content={
                     "message": "Collection name not found or invalid!"}
                 )
     except Exception as e:
-        return JSONResponse(status_code=404, content={"message": str(e)})
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
     
 @app.post('/recover_snapshot', tags=["Snapshot"])
 async def recover_snapshot(data: RecoverSnapshot):
     try:
         collection_name, path_snapshot = data.collection_name, data.snapshot_name
-        print(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("recover_snapshot payload: %s", data)
         if collection_name.split("_")[1] not in ["Employees", "Customers"]:
-            return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+            return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
 
-        if not await _check_exist(collection_name):
-            await client.create_collection(
-                collection_name=collection_name,
-                vectors_config=VectorParams(size=4096, distance=Distance.COSINE, on_disk=True),
-                hnsw_config=models.HnswConfigDiff(
-                    m=16,
-                    ef_construct=200, 
-                ),
-                quantization_config=models.BinaryQuantization(
-                    binary=models.BinaryQuantizationConfig(always_ram=True)
-                )
-            )
+        await _ensure_collection(collection_name)
         await client.recover_snapshot(
             collection_name=collection_name, location=f"file:///qdrant/snapshots/{path_snapshot}"
         )
-        return JSONResponse(status_code=200, content={"message": "Recover snapshot successfully"})
+        _known_collections.add(collection_name)
+        return ORJSONResponse(status_code=200, content={"message": "Recover snapshot successfully"})
     except Exception as e:
-        return JSONResponse(status_code=404, content={"message": str(e)})
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
 
 # @app.get('/delete_snapshot')
 # async def delete_snapshot():
@@ -202,7 +413,7 @@ async def recover_snapshot(data: RecoverSnapshot):
 #         client.delete_snapshot(
 #             collection_name="Employees", snapshot_name=f"{snapshot.name}"
 #         )
-#     return JSONResponse(status_code=200, content={"message": "Delete snapshot successfully"})
+#     return ORJSONResponse(status_code=200, content={"message": "Delete snapshot successfully"})
 
 async def _enforce_face_limit(collection_name: str, employee_id: str, limit: int = 10):
     scroll_filter = models.Filter(
@@ -233,7 +444,7 @@ async def _enforce_face_limit(collection_name: str, employee_id: str, limit: int
         points_to_delete = [p.id for p in sorted_points[:num_to_delete]]
 
         if points_to_delete:
-            print(f"User {employee_id} has {len(points)} faces. Deleting {len(points_to_delete)} old face(s)...")
+            logger.info(f"User {employee_id} has {len(points)} faces. Deleting {len(points_to_delete)} old face(s)...")
             await client.delete(
                 collection_name=collection_name,
                 points_selector=models.PointIdsList(points=points_to_delete)
@@ -242,49 +453,49 @@ async def _enforce_face_limit(collection_name: str, employee_id: str, limit: int
 @app.post("/insert_point", tags=["Point"])
 async def insert_point(data:InsertPoint):
     collection_name = data.collection_name
-    embedding = data.vector_embedding
+    embedding = _decode_embedding(data.vector_embedding_b64, data.vector_dtype, data.vector_embedding)
     id = data.id
     name = data.name
     store_id = data.store_id
     is_update_id = data.is_update_id
-    time_created = datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S")
     
     if collection_name == "" or collection_name is None:
-        return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
     
     if not await _check_exist(collection_name):
-        return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
     
     if embedding is None or len(embedding) != 4096:
-        return JSONResponse(status_code=404, content={"message": "Embedding not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Embedding not found or invalid!"})
     
     if id is None or id == "":
-        return JSONResponse(status_code=404, content={"message": "ID not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "ID not found or invalid!"})
     if name is None or id == "":
-        return JSONResponse(status_code=404, content={"message": "Name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Name not found or invalid!"})
     
-    _id = str(uuid4())
-
     try:
         if not is_update_id:
             await _enforce_face_limit(collection_name, id, limit=10)
     except Exception as e:
-        print(f"Error checking face limit: {str(e)}")
+        logger.error(f"Error checking face limit: {str(e)}")
 
-    payload = {
-        'id': id,
-        'name': name,
-        "store_id": store_id,
-        'time_created': time_created
-    }
-    
     if is_update_id:
+        # Updates reuse the stored point's id and payload, so skip the
+        # uuid4/os.urandom call and the timestamp entirely
         p = await _get_points(collection_name, id)
         if p is not None:
             _id = p[0].id
             payload = p[0].payload
         else:
-            return JSONResponse(status_code=404, content={"message": "ID not found!"})
+            return ORJSONResponse(status_code=404, content={"message": "ID not found!"})
+    else:
+        _id = str(uuid4())
+        payload = {
+            'id': id,
+            'name': name,
+            "store_id": store_id,
+            'time_created': _timestamp()
+        }
     try:
         point = PointStruct(id=_id,
                             vector=embedding,
@@ -292,25 +503,121 @@ async def insert_point(data:InsertPoint):
                 )
         await client.upsert(collection_name=collection_name, points=[point])
         
-        return JSONResponse(status_code=201, content={"message": "Point inserted"})
+        return ORJSONResponse(status_code=201, content={"message": "Point inserted"})
     except Exception as e:
-        return JSONResponse(status_code=404, content={"message": str(e)})
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
     
 
+def _select_match(result):
+    """Reduce raw search hits to at most one (score, payload) best match.
+
+    A single walk over the hits accumulates per-id votes (hits above
+    THRESHOLD_PASS), each id's best score and first payload, and the
+    best overall hit above THRESHOLD_SEARCH, which breaks ties between
+    ids with equal votes. The old implementation rescanned the hit
+    list once per one of those facts.
+    """
+    stats = {}  # id -> [votes, best_score, first_payload, first_vote_idx]
+    best_search = None
+    for idx, hit in enumerate(result):
+        hit_id = hit.payload['id']
+        entry = stats.get(hit_id)
+        if entry is None:
+            entry = stats[hit_id] = [0, hit.score, hit.payload, idx]
+        elif hit.score > entry[1]:
+            entry[1] = hit.score
+        if hit.score >= THRESHOLD_PASS:
+            if entry[0] == 0:
+                entry[3] = idx
+            entry[0] += 1
+        if hit.score >= THRESHOLD_SEARCH and (
+            best_search is None or hit.score > best_search[0]
+        ):
+            best_search = (hit.score, hit.payload)
+
+    voted = [entry for entry in stats.values() if entry[0] > 0]
+    if not voted:
+        return []
+
+    if len(voted) > 1 and len(set(entry[0] for entry in voted)) == 1:
+        # Every candidate drew the same number of votes; fall back to
+        # the single best-scoring hit above THRESHOLD_SEARCH
+        return [best_search] if best_search is not None else []
+
+    best = max(voted, key=lambda entry: (entry[0], -entry[3]))
+    return [(best[1], best[2])]
+
+@app.post("/insert_points", tags=["Point"])
+async def insert_points(data: InsertPointsBatch):
+    collection_name = data.collection_name
+    points = data.points
+    time_created = _timestamp()
+
+    if collection_name == "" or collection_name is None:
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+
+    if not await _check_exist(collection_name):
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+
+    if not points:
+        return ORJSONResponse(status_code=404, content={"message": "Points not found or invalid!"})
+
+    embeddings = [
+        _decode_embedding(item.vector_embedding_b64, item.vector_dtype, item.vector_embedding)
+        for item in points
+    ]
+    for item, embedding in zip(points, embeddings):
+        if embedding is None or len(embedding) != 4096:
+            return ORJSONResponse(status_code=404, content={"message": "Embedding not found or invalid!"})
+        if item.id is None or item.id == "":
+            return ORJSONResponse(status_code=404, content={"message": "ID not found or invalid!"})
+        if item.name is None or item.name == "":
+            return ORJSONResponse(status_code=404, content={"message": "Name not found or invalid!"})
+
+    async def _limit_one(employee_id):
+        try:
+            await _enforce_face_limit(collection_name, employee_id, limit=10)
+        except Exception as e:
+            logger.error(f"Error checking face limit: {str(e)}")
+
+    # One limit check per distinct id, run concurrently instead of one
+    # awaited round-trip per point
+    await asyncio.gather(*(_limit_one(employee_id) for employee_id in {item.id for item in points}))
+
+    try:
+        point_structs = [
+            PointStruct(
+                id=str(uuid4()),
+                vector=embedding,
+                payload={
+                    'id': item.id,
+                    'name': item.name,
+                    "store_id": item.store_id,
+                    'time_created': time_created
+                }
+            )
+            for item, embedding in zip(points, embeddings)
+        ]
+        await client.upsert(collection_name=collection_name, points=point_structs)
+
+        return ORJSONResponse(status_code=201, content={"message": "Points inserted"})
+    except Exception as e:
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
+
 @app.post("/search_point", tags=["Point"])
 async def search_point(data: SearchPoint):
     collection_name = data.collection_name
-    vector_embedding = data.vector_embedding
+    vector_embedding = _decode_embedding(data.vector_embedding_b64, data.vector_dtype, data.vector_embedding)
     store_id = data.store_id
     if collection_name is None or collection_name == "":
-        return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
     
     if not await _check_exist(collection_name):
-        return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
     
     # if vector_embedding is None or len(vector_embedding) != 128 or not all(isinstance(i, (int, float)) for i in vector_embedding) or not all(-1 <= i <= 1 for i in vector_embedding):
     if vector_embedding is None or len(vector_embedding) != 4096:
-        return JSONResponse(status_code=404, content={"message": "Embedding not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Embedding not found or invalid!"})
     
     try:
         result = await client.search(
@@ -325,75 +632,95 @@ async def search_point(data: SearchPoint):
                     )
                 ]
             ),
+            # HNSW traversal with quantized rescore instead of exact=True,
+            # which brute-forced every 4096-dim vector in the collection
             search_params=models.SearchParams(
-                hnsw_ef=128,
-                exact=True,
+                hnsw_ef=200,
+                exact=False,
                 quantization=models.QuantizationSearchParams(
                     rescore=True,       
-                    oversampling=2.0  
+                    oversampling=1.5  
                 )
             ),
             timeout=30
         )
-        print([(i.score, i.payload) for i in result])
+        data = _select_match(result)
 
-        data = [(i.score, i.payload) for i in result if i.score >= THRESHOLD_PASS]
-        
-        print("Data search: ", data)
-        
         if len(data) == 0:
-            return JSONResponse(status_code=200, content={"message": "Point not found", "data": []})
-        
-        data_dict = {}
-        for i in result:
-            if i.score >= THRESHOLD_PASS:
-                if i.payload['id'] in data_dict:
-                    data_dict[i.payload['id']] += 1
-                else:
-                    data_dict[i.payload['id']] = 1
-        
-        print(data_dict)
-        
-        if len(set(data_dict.values())) == 1 and len(data_dict) > 1:
-            print("All values are the same")
-            data_result = [(i.score, i.payload) for i in result if i.score >= THRESHOLD_SEARCH]
-            
-            if len(data_result) == 0:
-                return JSONResponse(status_code=200, content={"message": "Point not found", "data": []})
-                
-            i_max = max(data_result, key=lambda x: x[0])
-            score = i_max[0]
-            payload = i_max[1]
-            return JSONResponse(status_code=200, content={"message": "Point found", "data": [(score,payload)]})
-        
-        id_max = max(data_dict, key=data_dict.get)
-        
-        scores = []
-        for i in result:
-            if i.payload['id'] == id_max:
-                scores.append(i.score)
-        
-        score = max(scores)
-        
-        payload = None
-        for i in result:
-            if i.payload['id'] == id_max:
-                payload = i.payload
-                break
-        
-        return JSONResponse(status_code=200, content={"message": "Point found", "data": [(score, payload)]})
+            return ORJSONResponse(status_code=200, content={"message": "Point not found", "data": []})
+
+        return ORJSONResponse(status_code=200, content={"message": "Point found", "data": data})
+    except Exception as e:
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
+
+@app.post("/search_point_batch", tags=["Point"])
+async def search_point_batch(data: SearchPointBatch):
+    collection_name = data.collection_name
+    if data.vector_embeddings_b64:
+        vector_embeddings = [
+            _decode_embedding(b64_value, data.vector_dtype, None)
+            for b64_value in data.vector_embeddings_b64
+        ]
+    else:
+        vector_embeddings = data.vector_embeddings
+    store_id = data.store_id
+    if collection_name is None or collection_name == "":
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+
+    if not await _check_exist(collection_name):
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+
+    if vector_embeddings is None or any(v is None or len(v) != 4096 for v in vector_embeddings):
+        return ORJSONResponse(status_code=404, content={"message": "Embedding not found or invalid!"})
+
+    try:
+        requests = [
+            models.SearchRequest(
+                vector=vector_embedding,
+                limit=5,
+                filter=models.Filter(
+                    must=[
+                        models.FieldCondition(
+                            key="store_id",
+                            match=models.MatchValue(value=store_id)
+                        )
+                    ]
+                ),
+                params=models.SearchParams(
+                    hnsw_ef=200,
+                    exact=False,
+                    quantization=models.QuantizationSearchParams(
+                        rescore=True,
+                        oversampling=1.5
+                    )
+                ),
+                with_payload=True
+            )
+            for vector_embedding in vector_embeddings
+        ]
+        results = await client.search_batch(
+            collection_name=collection_name,
+            requests=requests,
+            timeout=30
+        )
+
+        data = [_select_match(result) for result in results]
+
+        return ORJSONResponse(status_code=200, content={"message": "Batch searched", "data": data})
     except Exception as e:
-        return JSONResponse(status_code=404, content={"message": str(e)})
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
 
 @app.delete("/delete_collection", tags=["Colection"])
 async def delete_collection(data: CreateCollection):
     collection_name = data.collection_name
     if collection_name is None:
-        return JSONResponse(status_code=404, content={"message": "Collection name not found!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found!"})
     if not await _check_exist(collection_name):
-        return JSONResponse(status_code=404, content={"message": "Collection name not found!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found!"})
     try:
         await client.delete_collection(collection_name)
+        _known_collections.discard(collection_name)
+        _last_snapshot.pop(collection_name, None)
         try:
             snapshots = await client.list_snapshots(collection_name=f"{collection_name}")
             for snapshot in snapshots:
@@ -401,23 +728,23 @@ async def delete_collection(data: CreateCollection):
                     collection_name=collection_name, snapshot_name=snapshot.name
                 )
         except Exception as e:
-            print(f"Error deleting snapshot: {str(e)}")
-        return JSONResponse(status_code=200, content={"message": "Collection deleted"})
+            logger.error(f"Error deleting snapshot: {str(e)}")
+        return ORJSONResponse(status_code=200, content={"message": "Collection deleted"})
     except Exception as e:
-        return JSONResponse(status_code=404, content={"message": str(e)})
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
 
 @app.delete("/delete_point", tags=["Point"])
 async def delete_point(data: DeletePoint):
     collection_name = data.collection_name
     id = data.id
     if collection_name is None or collection_name == "":
-        return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
     
     if not await _check_exist(collection_name):
-        return JSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "Collection name not found or invalid!"})
     
     if id is None or id == "":
-        return JSONResponse(status_code=404, content={"message": "ID not found or invalid!"})
+        return ORJSONResponse(status_code=404, content={"message": "ID not found or invalid!"})
     
     try:
         await client.delete(
@@ -433,9 +760,9 @@ async def delete_point(data: DeletePoint):
                 )
             )
         )
-        return JSONResponse(status_code=200, content={"message": "Point deleted"})
+        return ORJSONResponse(status_code=200, content={"message": "Point deleted"})
     except Exception as e:
-        return JSONResponse(status_code=404, content={"message": str(e)})
+        return ORJSONResponse(status_code=404, content={"message": str(e)})
 
 @app.get("/health", tags=["Health"])
 async def health_check():
@@ -453,7 +780,7 @@ async def health_check():
             "qdrant_port": QDRANT_PORT
         }
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "status": "error",
@@ -1,9 +1,11 @@
 """
 Database logging configuration for qdrant_database_FE service.
 """
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from datetime import datetime
 
 def setup_database_logging():
@@ -11,22 +13,22 @@ def setup_database_logging():
     # Ensure logs directory exists
     logs_dir = "../logs"
     os.makedirs(logs_dir, exist_ok=True)
-    
+
     # Common log format
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
     date_format = "%Y-%m-%d %H:%M:%S"
-    
+
     # Clear any existing handlers
     logging.getLogger().handlers.clear()
-    
+
     # Create formatter
     formatter = logging.Formatter(log_format, date_format)
-    
+
     # ==== DATABASE SERVICE LOGGER ====
     database_logger = logging.getLogger("database")
     database_logger.setLevel(logging.INFO)
     database_logger.propagate = False
-    
+
     database_handler = logging.handlers.RotatingFileHandler(
         os.path.join(logs_dir, "database.log"),
         maxBytes=10*1024*1024,  # 10MB
@@ -34,13 +36,23 @@ def setup_database_logging():
         encoding="utf-8"
     )
     database_handler.setFormatter(formatter)
-    database_logger.addHandler(database_handler)
-    
-    # Console handler for development
+
+    # Console handler for development; quieter by default so the hot
+    # request path is not throttled by terminal writes
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    database_logger.addHandler(console_handler)
-    
+    console_handler.setLevel(os.getenv("CONSOLE_LOG_LEVEL", "WARNING"))
+
+    # Handlers sit behind a queue so logger.info in async handlers is a
+    # memory enqueue; a background thread does the file/console I/O
+    log_queue = queue.Queue(-1)
+    database_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue, database_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     database_logger.info("Database service logging initialized")
     return database_logger
 
@@ -2,7 +2,6 @@
 Script test face detection/recognition
 Kiểm tra xem ảnh có detect được face không và nhận diện được ai
 """
-import base64
 import requests
 import sys
 
@@ -14,6 +13,11 @@ FACE_API_URL = "http://localhost:2024"
 API_KEY = "gBoyON6XU978cIpI0x1r0Hs0JjL7Ms2cZ0LL27VH6" 
 # ==========================================
 
+# Session dùng chung: giữ keep-alive, không bắt tay TCP lại mỗi request
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
 def test_face_detection(image_path: str, store_id: str, role: str = "1"):
     """
     Test face detection và recognition
@@ -40,27 +44,21 @@ def test_face_detection(image_path: str, store_id: str, role: str = "1"):
         print(f"   ❌ Error reading file: {e}")
         return
     
-    # 2. Convert sang base64
-    print(f"\n2. Converting to base64...")
-    img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-    print(f"   ✅ Base64 length: {len(img_base64):,} characters")
-    
-    # 3. Test face recognition
-    print(f"\n3. Testing face recognition...")
+    # 2. Test face recognition (gửi bytes thẳng qua multipart, không base64)
+    print(f"\n2. Testing face recognition...")
     print(f"   Store ID: {store_id}")
     print(f"   Role: {'Employee' if role == '1' else 'Customer'}")
     
     # --- TẠO HEADER CHỨA KEY ---
     headers = {
-        "Content-Type": "application/json",
         "X-API-Key": API_KEY  # <--- QUAN TRỌNG
     }
 
     try:
-        response = requests.post(
-            f"{FACE_API_URL}/face_recog_img_base64",
-            json={
-                "img_base64": img_base64,
+        response = session.post(
+            f"{FACE_API_URL}/face_recog_img",
+            files={"image": (image_path.split("/")[-1], img_bytes, "image/jpeg")},
+            data={
                 "role": role,
                 "store_id": store_id
             },
@@ -0,0 +1,56 @@
+"""
+Script test các endpoint multipart /face_recog_img và /create_face_img
+Bắt regression kiểu check_condition chết vì img_base64=None (trả 500)
+"""
+import requests
+import os
+import sys
+
+FACE_API_URL = "http://localhost:2024"
+MY_API_KEY = "gBoyON6XU978cIpI0x1r0Hs0JjL7Ms2cZ0LL27VH6"
+
+image_path = "./image/sontung2.jpg"
+
+session = requests.Session()
+
+with open(image_path, "rb") as f:
+    img_bytes = f.read()
+
+headers = {"X-API-Key": MY_API_KEY}
+failed = False
+
+# 1. /face_recog_img: mọi status đều chấp nhận được trừ 500
+response = session.post(
+    f"{FACE_API_URL}/face_recog_img",
+    files={"image": (os.path.basename(image_path), img_bytes, "image/jpeg")},
+    data={"role": "1", "store_id": "TEST1"},
+    headers=headers,
+    timeout=60,
+)
+print("face_recog_img:", response.status_code, response.json())
+if response.status_code == 500:
+    print("❌ /face_recog_img trả 500 - multipart request không được xử lý")
+    failed = True
+
+# 2. /create_face_img: tương tự, 500 là lỗi server với ảnh hợp lệ
+response = session.post(
+    f"{FACE_API_URL}/create_face_img",
+    files={"image": (os.path.basename(image_path), img_bytes, "image/jpeg")},
+    data={
+        "id": "345",
+        "name": "Sơn Tùng M-TP",
+        "is_update": True,
+        "role": "1",
+        "store_id": "TEST1",
+    },
+    headers=headers,
+    timeout=60,
+)
+print("create_face_img:", response.status_code, response.json())
+if response.status_code == 500:
+    print("❌ /create_face_img trả 500 - multipart request không được xử lý")
+    failed = True
+
+if failed:
+    sys.exit(1)
+print("✅ Cả hai endpoint multipart đều phản hồi bình thường")
@@ -1,26 +1,28 @@
-import base64
 import requests
 import os
 
 MY_API_KEY = "gBoyON6XU978cIpI0x1r0Hs0JjL7Ms2cZ0LL27VH6"
 
+# Session dùng chung: giữ keep-alive, không bắt tay TCP lại mỗi request
+session = requests.Session()
+session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
 image_path = "./image/sontung2.jpg"
 
 with open(image_path, "rb") as f:
     img_bytes = f.read()
 
-img_base64 = base64.b64encode(img_bytes).decode('utf-8')
-
 headers = {
-    "Content-Type": "application/json",
     "X-API-Key": MY_API_KEY 
 }
 
+# Gửi bytes thẳng qua multipart, bỏ bước base64 (+33% payload)
 try:
-    response = requests.post(
-        "http://localhost:2024/create_face_img_base64",
-        json={
-            "img_base64": img_base64,
+    response = session.post(
+        "http://localhost:2024/create_face_img",
+        files={"image": (os.path.basename(image_path), img_bytes, "image/jpeg")},
+        data={
             "id": "345",
             "name": "Sơn Tùng M-TP",
             "is_update": True,